@@ -4,6 +4,7 @@ import math
 import os
 from pathlib import Path
 from src import schemas
+from src.repo.postgres import close_pg_pool
 from src.services.public import retrieve_documents
 
 DATA_DIR = "data/ret"
@@ -64,122 +65,128 @@ if __name__ == "__main__":
     req.queries = queries
     print(f"Loaded {len(queries)} queries for evaluation.")
 
-    for k in POSSIBLE_K:
-        print(f"Evaluating retrieval with top_k={k}")
-        req.top_k = k
-        res = asyncio.run(retrieve_documents(request=req))
-
-        metrics_sum = {
-            "cumulative_recall": 0.0,
-            "oracle_recall": 0.0,
-            "ndcg_recall": 0.0,
-            "iou": 0.0,
-            "oracle_iou": 0.0,
-            "ndcg_iou": 0.0,
-            "mrr": 0.0,
-        }
-
-        for i, docs in enumerate(res.results):
-            gt = data[i]
-            gt_start = gt["start"]
-            gt_end = gt["end"]
-            gt_video_id = gt["video_id"]
-            gt_len = gt_end - gt_start
-
-            overlaps = []
-            recalls = []
-            ious = []
-
-            retrieved_by_video = {}
-            first_relevant_rank = None
-
-            for idx, doc in enumerate(docs):
-                try:
-                    _, start, end = doc.payload.metadata.title.split("||")
-                    start, end = int(start), int(end)
-                    doc_video_id = doc.payload.metadata.document_id
-                except Exception:
-                    overlaps.append(0)
-                    recalls.append(0)
-                    ious.append(0)
-                    print(
-                        "Error parsing document title (start, end):",
-                        doc.payload.metadata.title,
-                    )
-                    continue
-
-                # For IoU@k calculation
-                if doc_video_id not in retrieved_by_video:
-                    retrieved_by_video[doc_video_id] = []
-                retrieved_by_video[doc_video_id].append((start, end))
-
-                # For individual metrics
-                if doc_video_id != gt_video_id:
-                    overlap = 0
-                    union = gt_len + (end - start)
-                else:
-                    overlap = get_overlap(gt_start, gt_end, start, end)
-                    union = gt_len + (end - start) - overlap
-
-                if overlap > 0 and first_relevant_rank is None:
-                    first_relevant_rank = idx + 1
-
-                overlaps.append(overlap)
-                recalls.append(overlap / gt_len if gt_len > 0 else 0)
-                ious.append(overlap / union if union > 0 else 0)
-
-            # MRR
-            if first_relevant_rank:
-                metrics_sum["mrr"] += 1.0 / first_relevant_rank
-
-            # Cumulative Recall
-            metrics_sum["cumulative_recall"] += sum(recalls)
-
-            # Oracle
-            metrics_sum["oracle_recall"] += max(recalls) if recalls else 0
-            metrics_sum["oracle_iou"] += max(ious) if ious else 0
-            # IoU@k
-            total_retrieved_len = 0
-            for vid, intervals in retrieved_by_video.items():
-                total_retrieved_len += get_union_length(intervals)
-
-            matching_intervals = retrieved_by_video.get(gt_video_id, [])
-
-            # Merge matching intervals to get disjoint set for intersection calculation
-            sorted_matching = sorted(matching_intervals, key=lambda x: x[0])
-            merged_matching = []
-            for s, e in sorted_matching:
-                if not merged_matching:
-                    merged_matching.append((s, e))
-                else:
-                    ls, le = merged_matching[-1]
-                    if s < le:
-                        merged_matching[-1] = (ls, max(le, e))
+    # One event loop for the whole run so the Postgres pool is reused
+    with asyncio.Runner() as runner:
+        for k in POSSIBLE_K:
+            print(f"Evaluating retrieval with top_k={k}")
+            req.top_k = k
+            res = runner.run(retrieve_documents(request=req))
+
+            metrics_sum = {
+                "cumulative_recall": 0.0,
+                "oracle_recall": 0.0,
+                "ndcg_recall": 0.0,
+                "iou": 0.0,
+                "oracle_iou": 0.0,
+                "ndcg_iou": 0.0,
+                "mrr": 0.0,
+            }
+
+            for i, docs in enumerate(res.results):
+                gt = data[i]
+                gt_start = gt["start"]
+                gt_end = gt["end"]
+                gt_video_id = gt["video_id"]
+                gt_len = gt_end - gt_start
+
+                overlaps = []
+                recalls = []
+                ious = []
+
+                retrieved_by_video = {}
+                first_relevant_rank = None
+
+                for idx, doc in enumerate(docs):
+                    try:
+                        _, start, end = doc.payload.metadata.title.split("||")
+                        start, end = int(start), int(end)
+                        doc_video_id = doc.payload.metadata.document_id
+                    except Exception:
+                        overlaps.append(0)
+                        recalls.append(0)
+                        ious.append(0)
+                        print(
+                            "Error parsing document title (start, end):",
+                            doc.payload.metadata.title,
+                        )
+                        continue
+
+                    # For IoU@k calculation
+                    if doc_video_id not in retrieved_by_video:
+                        retrieved_by_video[doc_video_id] = []
+                    retrieved_by_video[doc_video_id].append((start, end))
+
+                    # For individual metrics
+                    if doc_video_id != gt_video_id:
+                        overlap = 0
+                        union = gt_len + (end - start)
                     else:
+                        overlap = get_overlap(gt_start, gt_end, start, end)
+                        union = gt_len + (end - start) - overlap
+
+                    if overlap > 0 and first_relevant_rank is None:
+                        first_relevant_rank = idx + 1
+
+                    overlaps.append(overlap)
+                    recalls.append(overlap / gt_len if gt_len > 0 else 0)
+                    ious.append(overlap / union if union > 0 else 0)
+
+                # MRR
+                if first_relevant_rank:
+                    metrics_sum["mrr"] += 1.0 / first_relevant_rank
+
+                # Cumulative Recall
+                metrics_sum["cumulative_recall"] += sum(recalls)
+
+                # Oracle
+                metrics_sum["oracle_recall"] += max(recalls) if recalls else 0
+                metrics_sum["oracle_iou"] += max(ious) if ious else 0
+                # IoU@k
+                total_retrieved_len = 0
+                for vid, intervals in retrieved_by_video.items():
+                    total_retrieved_len += get_union_length(intervals)
+
+                matching_intervals = retrieved_by_video.get(gt_video_id, [])
+
+                # Merge matching intervals to get disjoint set for intersection calculation
+                sorted_matching = sorted(matching_intervals, key=lambda x: x[0])
+                merged_matching = []
+                for s, e in sorted_matching:
+                    if not merged_matching:
                         merged_matching.append((s, e))
+                    else:
+                        ls, le = merged_matching[-1]
+                        if s < le:
+                            merged_matching[-1] = (ls, max(le, e))
+                        else:
+                            merged_matching.append((s, e))
+
+                intersection_len = 0
+                for s, e in merged_matching:
+                    intersection_len += get_overlap(gt_start, gt_end, s, e)
+
+                union_len = gt_len + total_retrieved_len - intersection_len
+                metrics_sum["iou"] += (
+                    intersection_len / union_len if union_len > 0 else 0
+                )
+
+                # nDCG
+                metrics_sum["ndcg_recall"] += calculate_ndcg(recalls, k)
+                metrics_sum["ndcg_iou"] += calculate_ndcg(ious, k)
+
+            num_queries = len(res.results)
+            if num_queries == 0:
+                print(f"No results returned for k={k}")
+                continue
+
+            print(f"Results for k={k}:")
+            for key, val in metrics_sum.items():
+                print(f"  avg_{key}: {val / num_queries:.4f}")
 
-            intersection_len = 0
-            for s, e in merged_matching:
-                intersection_len += get_overlap(gt_start, gt_end, s, e)
-
-            union_len = gt_len + total_retrieved_len - intersection_len
-            metrics_sum["iou"] += intersection_len / union_len if union_len > 0 else 0
-
-            # nDCG
-            metrics_sum["ndcg_recall"] += calculate_ndcg(recalls, k)
-            metrics_sum["ndcg_iou"] += calculate_ndcg(ious, k)
-
-        num_queries = len(res.results)
-        if num_queries == 0:
-            print(f"No results returned for k={k}")
-            continue
-
-        print(f"Results for k={k}:")
-        for key, val in metrics_sum.items():
-            print(f"  avg_{key}: {val / num_queries:.4f}")
+            with open(os.path.join(DATA_DIR, "retrieval_eval_results.txt"), "a") as f:
+                f.write(f"Results for k={k}:\n")
+                for key, val in metrics_sum.items():
+                    f.write(f"  avg_{key}: {val / num_queries:.4f}\n")
+                f.write("\n")
 
-        with open(os.path.join(DATA_DIR, "retrieval_eval_results.txt"), "a") as f:
-            f.write(f"Results for k={k}:\n")
-            for key, val in metrics_sum.items():
-                f.write(f"  avg_{key}: {val / num_queries:.4f}\n")
-            f.write("\n")
+        runner.run(close_pg_pool())
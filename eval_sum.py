@@ -1,4 +1,5 @@
 import os
+import asyncio
 import json
 import re
 import torch
@@ -115,21 +116,23 @@ if __name__ == "__main__":
     ]
     prompts = get_summarization_prompts(documents_list=raw_texts_list)
 
-    for i, prompt in enumerate(prompts):
-        sum_path = os.path.join(DATA_DIR, "summaries", f"summaries_{i}.json")
-        if os.path.exists(sum_path):
-            print(f"Summaries for batch {i} already exist. Skipping...")
-            continue
-        try:
-            res = generate(prompts=[prompt], model="gpt-oss-120b")
-            summaries_list = parse_summarization_responses(
-                res, raw_texts_list[i : i + 1]
-            )
-            with open(sum_path, "w", encoding="utf-8") as f:
-                json.dump(summaries_list, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Error during generation at batch {i}: {e}")
-            continue
+    # One loop for the whole run so the async LLM client is reused across batches
+    with asyncio.Runner() as runner:
+        for i, prompt in enumerate(prompts):
+            sum_path = os.path.join(DATA_DIR, "summaries", f"summaries_{i}.json")
+            if os.path.exists(sum_path):
+                print(f"Summaries for batch {i} already exist. Skipping...")
+                continue
+            try:
+                res = runner.run(generate(prompts=[prompt], model="gpt-oss-120b"))
+                summaries_list = parse_summarization_responses(
+                    res, raw_texts_list[i : i + 1]
+                )
+                with open(sum_path, "w", encoding="utf-8") as f:
+                    json.dump(summaries_list, f, ensure_ascii=False, indent=2)
+            except Exception as e:
+                print(f"Error during generation at batch {i}: {e}")
+                continue
 
     summaries: list[str] = []
     for i in range(len(prompts)):
@@ -11,10 +11,11 @@ router = APIRouter()
     fn_id="generate-responses",
     trigger=inngest.TriggerEvent(event="rag/generate-responses"),
     retries=0,
+    output_type=schemas.GenerationResponse,
 )
-async def generate_responses(ctx: inngest.Context) -> dict[str, any]:
+async def generate_responses(ctx: inngest.Context) -> schemas.GenerationResponse:
     request = schemas.GenerationRequest.model_validate(ctx.event.data)
-    return (await public_svcs.generate_responses(request)).model_dump()
+    return await public_svcs.generate_responses(request)
 
 
 @router.post(
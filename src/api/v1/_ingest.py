@@ -11,10 +11,11 @@ router = APIRouter()
     fn_id="ingest-documents",
     trigger=inngest.TriggerEvent(event="rag/ingest-documents"),
     retries=0,
+    output_type=schemas.IngestionResponse,
 )
-async def ingest_documents(ctx: inngest.Context) -> dict[str, any]:
+async def ingest_documents(ctx: inngest.Context) -> schemas.IngestionResponse:
     request = schemas.DocumentIngestionRequest.model_validate(ctx.event.data)
-    return (await public_svcs.ingest_documents(request)).model_dump()
+    return await public_svcs.ingest_documents(request)
 
 
 @router.post(
@@ -33,10 +34,11 @@ async def ingest_documents_2(
     fn_id="ingest-audios",
     trigger=inngest.TriggerEvent(event="rag/ingest-audios"),
     retries=0,
+    output_type=schemas.IngestionResponse,
 )
-async def ingest_audios(ctx: inngest.Context) -> dict[str, any]:
+async def ingest_audios(ctx: inngest.Context) -> schemas.IngestionResponse:
     request = schemas.AudioIngestionRequest.model_validate(ctx.event.data)
-    return (await public_svcs.ingest_audios(request)).model_dump()
+    return await public_svcs.ingest_audios(request)
 
 
 @router.post(
@@ -11,10 +11,11 @@ router = APIRouter()
     fn_id="retrieve-documents",
     trigger=inngest.TriggerEvent(event="rag/retrieve-documents"),
     retries=0,
+    output_type=schemas.RetrievalResponse,
 )
-async def retrieve_documents(ctx: inngest.Context) -> dict[str, any]:
+async def retrieve_documents(ctx: inngest.Context) -> schemas.RetrievalResponse:
     request = schemas.RetrievalRequest.model_validate(ctx.event.data)
-    return (await public_svcs.retrieve_documents(request)).model_dump()
+    return await public_svcs.retrieve_documents(request)
 
 
 @router.post(
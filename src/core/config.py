@@ -9,6 +9,12 @@ rng = random.Random(42)
 # llm provider api key
 CEREBRAS_API_KEY = os.getenv("CEREBRAS_API_KEY", None)
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", None)
+# max concurrent requests per generate() call
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", 16))
+# sqlite file caching completions by (model, prompt); empty disables
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "")
+# max concurrent Gemini chunking requests
+GEMINI_CONCURRENCY = int(os.getenv("GEMINI_CONCURRENCY", 5))
 
 # chunking config
 MAX_TOKENS = int(os.getenv("MAX_TOKENS", "1024"))
@@ -18,10 +24,21 @@ OVERLAP_TOKENS = int(os.getenv("OVERLAP_TOKENS", "200"))
 DENSE_MODEL = os.getenv("DENSE_MODEL", "embeddinggemma-300m")
 DENSE_MODEL_PATH = os.getenv("DENSE_MODEL_PATH", "google/embeddinggemma-300m")
 DENSE_DIM = int(os.getenv("DENSE_DIM", 768))
+DENSE_BATCH_SIZE = int(os.getenv("DENSE_BATCH_SIZE", 32))
+DENSE_QUERY_CACHE_SIZE = int(os.getenv("DENSE_QUERY_CACHE_SIZE", 8192))
+# move the embedder back to CPU after each call instead of keeping it on the GPU
+DENSE_UNLOAD = os.getenv("DENSE_UNLOAD", "false").lower() == "true"
+# precision of the HNSW index and distance computation ("fp32" or "fp16")
+DENSE_PRECISION = os.getenv("DENSE_PRECISION", "fp32")
+if DENSE_PRECISION not in ("fp32", "fp16"):
+    raise ValueError("DENSE_PRECISION must be either 'fp32' or 'fp16'.")
 
 # reranking model
 RERANKING_MODEL = os.getenv("RERANKING_MODEL", "bge-reranker-v2-m3")
 RERANKING_MODEL_PATH = os.getenv("RERANKING_MODEL_PATH", "BAAI/bge-reranker-v2-m3")
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", 64))
+# move the reranker back to CPU after each call instead of keeping it on the GPU
+RERANK_UNLOAD = os.getenv("RERANK_UNLOAD", "false").lower() == "true"
 
 # utils
 WORD_PROCESS_METHOD = os.getenv("WORD_PROCESS_METHOD", "stem")
@@ -30,6 +47,13 @@ RRF_K = int(os.getenv("RRF_K", 2))
 if not RRF_K > 0:
     raise ValueError("RRF_K must be a positive integer.")
 FUSION_ALPHA = float(os.getenv("FUSION_ALPHA", 0.7))
+# batches of at least this many texts are tokenized in a process pool (0 disables)
+TOKENIZE_PARALLEL_MIN = int(os.getenv("TOKENIZE_PARALLEL_MIN", 64))
+TOKENIZE_WORKERS = int(os.getenv("TOKENIZE_WORKERS", os.cpu_count() or 1))
+
+# dense query cache: reuse results for queries within this cosine similarity (0 disables)
+PROXIMITY_TAU = float(os.getenv("PROXIMITY_TAU", 0.0))
+PROXIMITY_CACHE_SIZE = int(os.getenv("PROXIMITY_CACHE_SIZE", 256))
 
 # postgres
 POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
@@ -37,6 +61,16 @@ POSTGRES_PORT = int(os.getenv("POSTGRES_PORT", "5432"))
 POSTGRES_USER = os.getenv("POSTGRES_USER", "postgres")
 POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "pg")
 POSTGRES_DB = os.getenv("POSTGRES_DB", "cs419_db")
+POSTGRES_POOL_MIN_SIZE = int(os.getenv("POSTGRES_POOL_MIN_SIZE", 4))
+POSTGRES_POOL_MAX_SIZE = int(os.getenv("POSTGRES_POOL_MAX_SIZE", 32))
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", 80))
+# e.g. "64MB"; empty keeps the server default
+POSTGRES_WORK_MEM = os.getenv("POSTGRES_WORK_MEM", "")
+
+# nodes encoded and written per batch during ingestion
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", 256))
+if not INGEST_BATCH_SIZE > 0:
+    raise ValueError("INGEST_BATCH_SIZE must be a positive integer.")
 
 # local storage
 LOCAL_STORAGE_PATH = os.getenv("LOCAL_STORAGE_PATH", "./.storage")
@@ -48,3 +82,5 @@ CHUNKED_TRANSCRIPT_STORAGE_PATH = os.path.join(
 
 # speech to text
 SPEECH2TEXT_MODEL = os.getenv("SPEECH2TEXT_MODEL", "small")
+# free GPU memory after each transcription batch instead of keeping the model resident
+SPEECH2TEXT_UNLOAD = os.getenv("SPEECH2TEXT_UNLOAD", "false").lower() == "true"
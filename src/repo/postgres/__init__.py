@@ -1,4 +1,4 @@
-from ._storage import upsert_data
+from ._storage import upsert_data, close_pg_pool
 from ._retrieve import (
     dense_search,
     sparse_search,
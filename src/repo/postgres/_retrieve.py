@@ -1,5 +1,8 @@
+import logging
+import numpy as np
 from typing import Optional, Literal
 from collections import Counter
+from functools import lru_cache
 from psycopg import sql
 from pgvector import Vector
 from src import schemas
@@ -7,9 +10,13 @@ from src.core import config
 from src.utils import *
 from ._storage import (
     get_pg_conn,
+    get_collection_version,
+    get_dense_column_type,
+    dense_operands,
     ensure_collection_exists,
     POSTINGS_LIST_TABLE_SUFFIX,
     DOC_FREQ_TABLE_SUFFIX,
+    VECTOR_TABLE_SUFFIX,
 )
 
 
@@ -29,9 +36,10 @@ def _rows_to_results(
                 sim_score = float(distance_to_similarity(sim_score))
             except Exception:
                 sim_score = float(score)
-        payload = schemas.DocumentPayload(
+        # Rows come from our own typed columns, so validation is skipped
+        payload = schemas.DocumentPayload.model_construct(
             text=text,
-            metadata=schemas.DocumentMetadata(
+            metadata=schemas.DocumentMetadata.model_construct(
                 document_id=document_id or "",
                 title=title or "",
                 file_name=file_name or "",
@@ -39,7 +47,7 @@ def _rows_to_results(
             ),
         )
         results.append(
-            schemas.RetrievedDocument(
+            schemas.RetrievedDocument.model_construct(
                 id=str(rid),
                 score=sim_score,
                 payload=payload,
@@ -48,199 +56,422 @@ def _rows_to_results(
     return results
 
 
-def dense_search(
-    query_embeddings: list[list[float]],
+# Composed statements are reused across calls (identifier quoting, object allocation)
+@lru_cache(maxsize=128)
+def _dense_query_tmpl(
+    collection_name: str, dense_name: str, dense_type: str
+) -> sql.Composed:
+    dense_col, query_vec, _ = dense_operands(dense_name, dense_type=dense_type)
+    # The ANN scan only reads the narrow vector table; payload is joined for the top k
+    return sql.SQL(
+        """
+        WITH cand AS (
+            SELECT id, {dense_col} <=> {query_vec} AS score
+            FROM {vec_table}
+            ORDER BY {dense_col} <=> {query_vec}
+            LIMIT %s
+        )
+        SELECT c.id,
+               c.score,
+               m.text,
+               m.document_id,
+               m.title,
+               m.file_name,
+               m.file_path
+        FROM cand c
+        JOIN {main_table} m ON m.id = c.id
+        ORDER BY c.score;
+        """
+    ).format(
+        vec_table=sql.Identifier(f"{collection_name}_{VECTOR_TABLE_SUFFIX}"),
+        main_table=sql.Identifier(collection_name),
+        dense_col=dense_col,
+        query_vec=query_vec,
+    )
+
+
+@lru_cache(maxsize=128)
+def _dense_batch_query_tmpl(
+    collection_name: str, dense_name: str, dense_type: str
+) -> sql.Composed:
+    # One statement for many queries: each unnested vector drives its own index scan
+    dense_col, query_vec, _ = dense_operands(
+        dense_name, query=sql.SQL("q.vec"), dense_type=dense_type
+    )
+    return sql.SQL(
+        """
+        SELECT q.qid,
+               t.id,
+               t.score,
+               m.text,
+               m.document_id,
+               m.title,
+               m.file_name,
+               m.file_path
+        FROM unnest(%s::vector[]) WITH ORDINALITY AS q (vec, qid)
+        CROSS JOIN LATERAL (
+            SELECT id, {dense_col} <=> {query_vec} AS score
+            FROM {vec_table}
+            ORDER BY {dense_col} <=> {query_vec}
+            LIMIT %s
+        ) t
+        JOIN {main_table} m ON m.id = t.id
+        ORDER BY q.qid, t.score;
+        """
+    ).format(
+        vec_table=sql.Identifier(f"{collection_name}_{VECTOR_TABLE_SUFFIX}"),
+        main_table=sql.Identifier(collection_name),
+        dense_col=dense_col,
+        query_vec=query_vec,
+    )
+
+
+def _first_misses(keys: list[tuple], rows_list: list[Optional[tuple]]) -> list[int]:
+    """Indices of uncached queries, keeping only the first of identical ones."""
+    first: dict[tuple, int] = {}
+    for i, (key, rows) in enumerate(zip(keys, rows_list)):
+        if rows is None:
+            first.setdefault(key, i)
+    return list(first.values())
+
+
+def _fill_duplicates(keys: list[tuple], rows_list: list[Optional[tuple]]) -> None:
+    """Copy fetched rows onto the repeated queries that were skipped."""
+    fetched = {keys[i]: rows for i, rows in enumerate(rows_list) if rows is not None}
+    for i, rows in enumerate(rows_list):
+        if rows is None:
+            rows_list[i] = fetched[keys[i]]
+
+
+# Raw result rows keyed by query + collection version (bumped on every upsert)
+_dense_cache = LRUCache(maxsize=1024)
+_sparse_cache = LRUCache(maxsize=1024)
+_hybrid_cache = LRUCache(maxsize=1024)
+# Near-duplicate dense queries, opt-in via PROXIMITY_TAU
+_proximity_cache = (
+    ProximityCache(tau=config.PROXIMITY_TAU, maxsize=config.PROXIMITY_CACHE_SIZE)
+    if config.PROXIMITY_TAU > 0
+    else None
+)
+
+
+async def dense_search(
+    query_embeddings: np.ndarray,
     collection_name: str,
     top_k: int = 5,
     dense_name: str = config.DENSE_MODEL,
 ) -> list[list[schemas.RetrievedDocument]]:
-    conn = get_pg_conn()
-    ensure_collection_exists(collection_name=collection_name, dense_name=dense_name)
-
-    logger.info(
-        f"pgvector.dense_search collection={collection_name} top_k={top_k} using={dense_name} op=<=> (cosine distance)"
+    await ensure_collection_exists(
+        collection_name=collection_name, dense_name=dense_name
     )
+    version = get_collection_version(collection_name)
+    dense_type = get_dense_column_type(collection_name, dense_name)
 
-    query_tmpl = sql.SQL(
-        """
-		SELECT id,
-			   {dense_col} <=> %s AS score,
-			   text,
-			   document_id,
-			   title,
-			   file_name,
-			   file_path
-		FROM {table}
-		ORDER BY {dense_col} <=> %s
-		LIMIT %s;
-		"""
-    ).format(
-        table=sql.Identifier(collection_name),
-        dense_col=sql.Identifier(dense_name),
+    logger.info(
+        "pgvector.dense_search collection=%s top_k=%d using=%s op=<=> (cosine distance)",
+        collection_name,
+        top_k,
+        dense_name,
     )
 
+    keys = [
+        (
+            np.asarray(emb, dtype=np.float32).tobytes(),
+            collection_name,
+            top_k,
+            dense_name,
+            version,
+        )
+        for emb in query_embeddings
+    ]
+    rows_list: list[Optional[tuple]] = [_dense_cache.get(key) for key in keys]
+    scope = (collection_name, top_k, dense_name, version)
+    if _proximity_cache is not None:
+        for i, rows in enumerate(rows_list):
+            if rows is None:
+                rows_list[i] = _proximity_cache.get(query_embeddings[i], scope)
+    misses = _first_misses(keys, rows_list)
+
+    if len(misses) == 1:
+        vec = Vector(query_embeddings[misses[0]])
+        async with get_pg_conn() as conn, conn.cursor(binary=True) as cur:
+            await cur.execute(
+                _dense_query_tmpl(collection_name, dense_name, dense_type),
+                (vec, vec, top_k),
+            )
+            rows_list[misses[0]] = tuple(await cur.fetchall())
+    elif misses:
+        # Send every cache miss as one batched statement
+        vecs = [Vector(query_embeddings[i]) for i in misses]
+        async with get_pg_conn() as conn, conn.cursor(binary=True) as cur:
+            await cur.execute(
+                _dense_batch_query_tmpl(collection_name, dense_name, dense_type),
+                (vecs, top_k),
+            )
+            grouped: dict[int, list[tuple]] = {}
+            for qid, *row in await cur.fetchall():
+                grouped.setdefault(qid, []).append(tuple(row))
+        for qid, i in enumerate(misses, start=1):
+            rows_list[i] = tuple(grouped.get(qid, ()))
+
+    for i in misses:
+        _dense_cache.put(keys[i], rows_list[i])
+        if _proximity_cache is not None:
+            _proximity_cache.put(query_embeddings[i], scope, rows_list[i])
+    _fill_duplicates(keys, rows_list)
+
+    debug = logger.isEnabledFor(logging.DEBUG)
     all_results: list[list[schemas.RetrievedDocument]] = []
-    with conn.cursor() as cur:
-        for emb in query_embeddings:
-            vec = Vector(emb)
-            cur.execute(query_tmpl, (vec, vec, top_k))
-            rows = cur.fetchall()
-            if not rows:
-                logger.debug("pgvector.dense_search: 0 candidates")
-            else:
-                preview = min(5, len(rows))
-                for i in range(preview):
-                    rid, dist, *_ = rows[i]
-                    try:
-                        d = float(dist)
-                    except Exception:
-                        d = 0.0
-                    logger.debug(
-                        f"dense cand[{i}] id={rid} dist={d:.6f} sim={1.0 - d:.6f}"
-                    )
-            # cosine distance -> similarity in [-1, 1] via (1 - distance)
-            all_results.append(
-                _rows_to_results(rows, distance_to_similarity=lambda d: 1.0 - d)
+    for rows in rows_list:
+        if debug and not rows:
+            logger.debug("pgvector.dense_search: 0 candidates")
+        elif debug:
+            for i, (rid, dist, *_) in enumerate(rows[:5]):
+                d = float(dist)
+                logger.debug(
+                    "dense cand[%d] id=%s dist=%.6f sim=%.6f", i, rid, d, 1.0 - d
+                )
+        # cosine distance -> similarity in [-1, 1] via (1 - distance)
+        all_results.append(
+            _rows_to_results(rows, distance_to_similarity=lambda d: 1.0 - d)
+        )
+
+    if debug:
+        logger.debug("dense_search cache: %s", _dense_cache.cache_info())
+        if _proximity_cache is not None:
+            logger.debug(
+                "dense_search proximity cache: %s", _proximity_cache.cache_info()
             )
 
     return all_results
 
 
-def sparse_search(
+@lru_cache(maxsize=10_000)
+def _query_terms(query_text: str) -> tuple[tuple[str, ...], tuple[int, ...]]:
+    """Tokenize a query into (terms, query term frequencies); memoized per text."""
+    term_counts = Counter(tokenize(texts=[query_text])[0])
+    return tuple(term_counts.keys()), tuple(term_counts.values())
+
+
+# idf and partial_bm25 are precomputed at ingest time by refresh_sparse_stats
+_SPARSE_SCORE_EXPRS = {
+    "tfidf": "p.freq",
+    "okapi-bm25": "p.partial_bm25",
+}
+
+
+@lru_cache(maxsize=128)
+def _sparse_query_tmpl(
+    collection_name: str, scoring_method: Literal["tfidf", "okapi-bm25"]
+) -> sql.Composed:
+    if scoring_method not in _SPARSE_SCORE_EXPRS:
+        raise ValueError(f"Unsupported scoring_method: {scoring_method}")
+
+    return sql.SQL(
+        """
+        WITH q (term, qtf) AS (
+            SELECT * FROM unnest(%s::text[], %s::int[])
+        ),
+        t AS (
+            SELECT q.term, q.qtf, d.idf
+            FROM q
+            JOIN {df_table} d ON d.term = q.term
+            WHERE d.doc_freq > 0
+        ),
+        scored AS (
+            SELECT p.doc_id AS id, COALESCE(SUM(t.qtf * t.idf * {score_expr}), 0) AS score
+            FROM t
+            JOIN {pl_table} p ON p.term = t.term
+            GROUP BY p.doc_id
+            ORDER BY score DESC
+            LIMIT %s
+        )
+        SELECT sc.id,
+               sc.score,
+               m.text,
+               m.document_id,
+               m.title,
+               m.file_name,
+               m.file_path
+        FROM scored sc
+        JOIN {main_table} m ON m.id = sc.id
+        ORDER BY sc.score DESC;
+        """
+    ).format(
+        main_table=sql.Identifier(collection_name),
+        df_table=sql.Identifier(f"{collection_name}_{DOC_FREQ_TABLE_SUFFIX}"),
+        pl_table=sql.Identifier(f"{collection_name}_{POSTINGS_LIST_TABLE_SUFFIX}"),
+        score_expr=sql.SQL(_SPARSE_SCORE_EXPRS[scoring_method]),
+    )
+
+
+async def sparse_search(
     query_texts: list[str],
     collection_name: str,
     top_k: int = 5,
     scoring_method: Literal["tfidf", "okapi-bm25"] = "okapi-bm25",
 ) -> list[list[schemas.RetrievedDocument]]:
-    conn = get_pg_conn()
-    ensure_collection_exists(collection_name=collection_name)
-
-    results_all: list[list[schemas.RetrievedDocument]] = []
-
-    # Precompute corpus stats once
-    with conn.cursor() as cur:
-        cur.execute(
-            sql.SQL("SELECT COUNT(*)::int, AVG(doc_len) FROM {}; ").format(
-                sql.Identifier(collection_name)
-            )
+    query_tmpl = _sparse_query_tmpl(collection_name, scoring_method)
+    await ensure_collection_exists(collection_name=collection_name)
+    version = get_collection_version(collection_name)
+
+    keys = [
+        (query_text, collection_name, top_k, scoring_method, version)
+        for query_text in query_texts
+    ]
+    rows_list: list[Optional[tuple]] = [_sparse_cache.get(key) for key in keys]
+    misses = _first_misses(keys, rows_list)
+
+    query_terms = {i: _query_terms(query_texts[i]) for i in misses}
+    for i in misses:
+        if not query_terms[i][0]:
+            rows_list[i] = ()
+            _sparse_cache.put(keys[i], rows_list[i])
+    misses = [i for i in misses if rows_list[i] is None]
+
+    # Send every cache miss in one pipelined round trip
+    if misses:
+        async with get_pg_conn() as conn, conn.pipeline():
+            cursors = []
+            for i in misses:
+                terms, qtfs = query_terms[i]
+                cur = conn.cursor(binary=True)
+                await cur.execute(query_tmpl, (list(terms), list(qtfs), top_k))
+                cursors.append(cur)
+            for i, cur in zip(misses, cursors):
+                rows_list[i] = tuple(await cur.fetchall())
+                await cur.close()
+                _sparse_cache.put(keys[i], rows_list[i])
+    _fill_duplicates(keys, rows_list)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("sparse_search cache: %s", _sparse_cache.cache_info())
+
+    return [_rows_to_results(rows) for rows in rows_list]
+
+
+# Each CTE reads the legs' (id, dist) / (id, score) rows and yields (id, score, first_seen);
+# ties keep the client-side order: dense ranks first, then sparse-only ranks
+_FUSION_CTES = {
+    "rrf": """
+        ranked AS (
+            SELECT id, %(alpha)s::float8 AS w, 0 AS leg,
+                   row_number() OVER (ORDER BY dist) - 1 AS rk
+            FROM dense
+            UNION ALL
+            SELECT id, 1 - %(alpha)s::float8 AS w, 1 AS leg,
+                   row_number() OVER (ORDER BY score DESC) - 1 AS rk
+            FROM sparse
+        ),
+        fused AS (
+            SELECT id,
+                   SUM(w * (1.0::float8 / (%(k)s + rk))) AS score,
+                   MIN(CASE WHEN leg = 0 THEN rk ELSE %(n)s + rk END) AS first_seen
+            FROM ranked
+            GROUP BY id
+            ORDER BY score DESC, first_seen
+            LIMIT %(n)s
+        )
+        """,
+    # Scores are mapped through mean +/- 3 sample stddevs of their own leg;
+    # a leg with no spread contributes a flat 0.5, as in _dbsf_normalize
+    "dbsf": """
+        legs AS (
+            SELECT id, 1 - dist AS score, %(alpha)s::float8 AS w, 0 AS leg,
+                   row_number() OVER (ORDER BY dist) - 1 AS rk
+            FROM dense
+            UNION ALL
+            SELECT id, score, 1 - %(alpha)s::float8 AS w, 1 AS leg,
+                   row_number() OVER (ORDER BY score DESC) - 1 AS rk
+            FROM sparse
+        ),
+        stats AS (
+            SELECT legs.*,
+                   avg(score) OVER (PARTITION BY leg) AS mu,
+                   stddev_samp(score) OVER (PARTITION BY leg) AS sd
+            FROM legs
+        ),
+        fused AS (
+            SELECT id,
+                   SUM(
+                       CASE WHEN COALESCE(sd, 0) = 0 THEN 0.5::float8
+                            ELSE w * ((score - (mu - 3 * sd))
+                                      / ((mu + 3 * sd) - (mu - 3 * sd)))
+                       END
+                   ) AS score,
+                   MIN(CASE WHEN leg = 0 THEN rk ELSE %(n)s + rk END) AS first_seen
+            FROM stats
+            GROUP BY id
+            ORDER BY score DESC, first_seen
+            LIMIT %(n)s
         )
-        row = cur.fetchone()
-        N = int(row[0]) if row and row[0] is not None else 0
-        avg_dl = float(row[1]) if row and row[1] is not None else 0.0
+        """,
+}
 
-        if N == 0:
-            return [[] for _ in query_texts]
 
-        pl_table = f"{collection_name}_{POSTINGS_LIST_TABLE_SUFFIX}"
-        df_table = f"{collection_name}_{DOC_FREQ_TABLE_SUFFIX}"
+@lru_cache(maxsize=128)
+def _hybrid_query_tmpl(
+    collection_name: str,
+    dense_name: str,
+    dense_type: str,
+    fusion_method: Literal["dbsf", "rrf"],
+) -> sql.Composed:
+    if fusion_method not in _FUSION_CTES:
+        raise ValueError(f"Unknown fusion method: {fusion_method}")
+
+    dense_col, query_vec, _ = dense_operands(
+        dense_name, query=sql.SQL("%(vec)s"), dense_type=dense_type
+    )
+    return sql.SQL(
+        """
+        WITH dense AS (
+            SELECT id, {dense_col} <=> {query_vec} AS dist
+            FROM {vec_table}
+            ORDER BY {dense_col} <=> {query_vec}
+            LIMIT %(n)s
+        ),
+        q (term, qtf) AS (
+            SELECT * FROM unnest(%(terms)s::text[], %(qtfs)s::int[])
+        ),
+        t AS (
+            SELECT q.term, q.qtf, d.idf
+            FROM q
+            JOIN {df_table} d ON d.term = q.term
+            WHERE d.doc_freq > 0
+        ),
+        sparse AS (
+            SELECT p.doc_id AS id, COALESCE(SUM(t.qtf * t.idf * p.partial_bm25), 0) AS score
+            FROM t
+            JOIN {pl_table} p ON p.term = t.term
+            GROUP BY p.doc_id
+            ORDER BY score DESC
+            LIMIT %(n)s
+        ),
+        {fusion}
+        SELECT f.id,
+               f.score,
+               m.text,
+               m.document_id,
+               m.title,
+               m.file_name,
+               m.file_path
+        FROM fused f
+        JOIN {main_table} m ON m.id = f.id
+        ORDER BY f.score DESC, f.first_seen;
+        """
+    ).format(
+        main_table=sql.Identifier(collection_name),
+        df_table=sql.Identifier(f"{collection_name}_{DOC_FREQ_TABLE_SUFFIX}"),
+        pl_table=sql.Identifier(f"{collection_name}_{POSTINGS_LIST_TABLE_SUFFIX}"),
+        vec_table=sql.Identifier(f"{collection_name}_{VECTOR_TABLE_SUFFIX}"),
+        dense_col=dense_col,
+        query_vec=query_vec,
+        fusion=sql.SQL(_FUSION_CTES[fusion_method]),
+    )
 
-        tokenized_texts = tokenize(texts=query_texts)
 
-        pl_select = sql.SQL("SELECT doc_id, freq FROM {} WHERE term = %s;").format(
-            sql.Identifier(pl_table)
-        )
-        df_select = sql.SQL("SELECT doc_freq FROM {} WHERE term = %s;").format(
-            sql.Identifier(df_table)
-        )
-        doc_select = sql.SQL(
-            """
-            SELECT id, text, document_id, title, file_name, file_path, doc_len
-            FROM {}
-            WHERE id = %s;
-            """
-        ).format(sql.Identifier(collection_name))
-
-        # Simple caches to avoid redundant queries within the same request batch
-        df_cache: dict[str, int] = {}
-        # Cache stores (doc_len, payload)
-        doc_cache: dict[str, tuple[int, schemas.DocumentPayload]] = {}
-
-        for q_idx, tokens in enumerate(tokenized_texts):
-            term_counts = Counter(tokens)
-            # doc_id -> RetrievedDocument
-            doc_scores: dict[str, schemas.RetrievedDocument] = {}
-
-            for term, query_tf in term_counts.items():
-                cur.execute(pl_select, (term,))
-                postings = cur.fetchall()  # rows of (doc_id, freq)
-                if not postings:
-                    continue
-
-                # fetch doc_freq (idf needs this)
-                if term in df_cache:
-                    df = df_cache[term]
-                else:
-                    cur.execute(df_select, (term,))
-                    df_row = cur.fetchone()
-                    df = int(df_row[0]) if df_row and df_row[0] is not None else 0
-                    df_cache[term] = df
-
-                # skip if df == 0 (no documents contain this term)
-                if df == 0:
-                    continue
-
-                for doc_id, tf in postings:
-                    sid = str(doc_id)
-
-                    # fetch payload + doc_len
-                    if sid in doc_cache:
-                        dl, payload = doc_cache[sid]
-                    else:
-                        cur.execute(doc_select, (doc_id,))
-                        drow = cur.fetchone()
-                        if not drow:
-                            continue
-                        (
-                            _,
-                            text,
-                            document_id,
-                            title,
-                            file_name,
-                            file_path,
-                            dl,
-                        ) = drow
-
-                        payload = schemas.DocumentPayload(
-                            text=text,
-                            metadata=schemas.DocumentMetadata(
-                                document_id=document_id or "",
-                                title=title or "",
-                                file_name=file_name or "",
-                                file_path=file_path or "",
-                            ),
-                        )
-                        dl = int(dl) if dl is not None else 0
-                        doc_cache[sid] = (dl, payload)
-
-                    if sid not in doc_scores:
-                        doc_scores[sid] = schemas.RetrievedDocument(
-                            id=sid,
-                            score=0.0,
-                            payload=payload,
-                        )
-
-                    idf = calc_idf(N=N, df=df)
-                    if scoring_method == "tfidf":
-                        doc_scores[sid].score += query_tf * calc_tfidf(tf=tf, idf=idf)
-                    elif scoring_method == "okapi-bm25":
-                        doc_scores[sid].score += query_tf * calc_okapi_bm25(
-                            tf=tf, idf=idf, dl=dl, avg_dl=avg_dl
-                        )
-                    else:
-                        raise ValueError(
-                            f"Unsupported scoring_method: {scoring_method}"
-                        )
-
-            retrieved_docs = list(doc_scores.values())
-            retrieved_docs.sort(key=lambda x: x.score, reverse=True)
-
-            results_all.append(retrieved_docs[:top_k])
-
-    return results_all
-
-
-def hybrid_search(
-    dense_query_embeddings: list[list[float]],
+async def hybrid_search(
+    dense_query_embeddings: np.ndarray,
     query_texts: list[str],
     collection_name: str,
     top_k: int = 5,
@@ -249,26 +480,70 @@ def hybrid_search(
     fusion_method: Literal["dbsf", "rrf"] = config.FUSION_METHOD,
     dense_name: str = config.DENSE_MODEL,
 ) -> list[list[schemas.RetrievedDocument]]:
-    # Overfetch separately then fuse client-side
     overfetch_amount = max(top_k, int(top_k * overfetch_mul))
 
-    dense_results = dense_search(
-        query_embeddings=dense_query_embeddings,
-        collection_name=collection_name,
-        top_k=overfetch_amount,
-        dense_name=dense_name,
+    await ensure_collection_exists(
+        collection_name=collection_name, dense_name=dense_name
     )
-    sparse_results = sparse_search(
-        query_texts=query_texts,
-        collection_name=collection_name,
-        top_k=overfetch_amount,
+    version = get_collection_version(collection_name)
+    dense_type = get_dense_column_type(collection_name, dense_name)
+    query_tmpl = _hybrid_query_tmpl(
+        collection_name, dense_name, dense_type, fusion_method
     )
 
-    fused_results: list[list[schemas.RetrievedDocument]] = []
-    for d_res, s_res in zip(dense_results, sparse_results):
-        fused = fuse_results(
-            results1=d_res, results2=s_res, alpha=alpha, method=fusion_method
-        )
-        fused_results.append(fused[:overfetch_amount])
+    # Scope of one fused result; RRF_K only matters for rrf
+    scope = (
+        collection_name,
+        overfetch_amount,
+        alpha,
+        fusion_method,
+        config.RRF_K if fusion_method == "rrf" else None,
+        dense_name,
+        version,
+    )
+    keys = [
+        (np.asarray(emb, dtype=np.float32).tobytes(), query_text, *scope)
+        for emb, query_text in zip(dense_query_embeddings, query_texts)
+    ]
+    rows_list: list[Optional[tuple]] = [_hybrid_cache.get(key) for key in keys]
+    # Fused rows also depend on the sparse leg, so near-duplicate vectors only match
+    # queries that tokenize to the same terms
+    scopes = [(_query_terms(query_text), *scope) for query_text in query_texts]
+    if _proximity_cache is not None:
+        for i, rows in enumerate(rows_list):
+            if rows is None:
+                rows_list[i] = _proximity_cache.get(
+                    dense_query_embeddings[i], scopes[i]
+                )
+    misses = _first_misses(keys, rows_list)
+
+    # Both legs and the fusion run server-side; one statement per query, pipelined
+    if misses:
+        async with get_pg_conn() as conn, conn.pipeline():
+            cursors = []
+            for i in misses:
+                terms, qtfs = _query_terms(query_texts[i])
+                cur = conn.cursor(binary=True)
+                await cur.execute(
+                    query_tmpl,
+                    {
+                        "vec": Vector(dense_query_embeddings[i]),
+                        "terms": list(terms),
+                        "qtfs": list(qtfs),
+                        "n": overfetch_amount,
+                        "alpha": alpha,
+                        "k": config.RRF_K,
+                    },
+                )
+                cursors.append(cur)
+            for i, cur in zip(misses, cursors):
+                rows_list[i] = tuple(await cur.fetchall())
+                await cur.close()
+                _hybrid_cache.put(keys[i], rows_list[i])
+                if _proximity_cache is not None:
+                    _proximity_cache.put(
+                        dense_query_embeddings[i], scopes[i], rows_list[i]
+                    )
+    _fill_duplicates(keys, rows_list)
 
-    return fused_results
+    return [_rows_to_results(rows) for rows in rows_list]
@@ -1,15 +1,64 @@
+import asyncio
+import numpy as np
 import psycopg
 from uuid import UUID
-from functools import lru_cache
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
 from psycopg import sql
-from pgvector import Vector
-from pgvector.psycopg import register_vector
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import AsyncConnectionPool
+from pgvector import HalfVector, Vector
+from pgvector.psycopg import register_vector_async
 from llama_index.core.schema import BaseNode
 from src import schemas
 from src.core import config
+from src.utils import logger
 
 POSTINGS_LIST_TABLE_SUFFIX = "pl"
 DOC_FREQ_TABLE_SUFFIX = "df"
+VECTOR_TABLE_SUFFIX = "vec"
+
+# Binary COPY needs the column types up front
+_DF_COPY_TYPES = ["text", "int4"]
+_PL_COPY_TYPES = ["text", "uuid", "int4"]
+_DF_STAGE_TABLE = "df_stage"
+
+# Actual storage type ("vector" or "halfvec") of each (collection, dense column)
+_dense_column_types: dict[tuple[str, str], str] = {}
+
+# Collections whose tables/indexes this process has already created and prewarmed
+_ensured_collections: set[tuple[str, str, int]] = set()
+# Per-collection guards so concurrent first queries run the DDL once; asyncio locks
+# belong to one event loop, so they are dropped together with the pool
+_ensure_locks: dict[str, asyncio.Lock] = {}
+
+# Bumped on every write so that search caches keyed on it go stale
+_collection_versions: dict[str, int] = {}
+
+# The single definition of BM25 (k1, b included); immutable SQL functions are inlined
+# by the planner into the scoring query
+CREATE_BM25_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION bm25_idf(df INT, n INT)
+RETURNS DOUBLE PRECISION
+LANGUAGE SQL IMMUTABLE PARALLEL SAFE
+AS $$ SELECT ln(1 + (n - df + 0.5)::float8 / (df + 0.5)) $$;
+
+CREATE OR REPLACE FUNCTION bm25_tf(
+    tf INT,
+    dl INT,
+    avg_dl DOUBLE PRECISION,
+    k1 DOUBLE PRECISION DEFAULT 1.5,
+    b DOUBLE PRECISION DEFAULT 0.75
+)
+RETURNS DOUBLE PRECISION
+LANGUAGE SQL IMMUTABLE PARALLEL SAFE
+AS $$ SELECT (tf * (k1 + 1)) / (tf + k1 * (1 - b + b * dl / avg_dl)) $$;
+"""
+
+# A pool is bound to the event loop that opened it
+_pool: Optional[AsyncConnectionPool] = None
+_pool_task: Optional[asyncio.Task] = None
+_pool_loop: Optional[asyncio.AbstractEventLoop] = None
 
 
 def _get_db_params() -> dict:
@@ -22,30 +71,162 @@ def _get_db_params() -> dict:
     }
 
 
-@lru_cache(maxsize=1)
-def get_pg_conn() -> psycopg.Connection:
+def get_collection_version(collection_name: str) -> int:
+    return _collection_versions.get(collection_name, 0)
+
+
+def get_dense_column_type(collection_name: str, dense_name: str) -> str:
+    """Stored type of the dense column ("vector" or "halfvec"), known once ensured."""
+    return _dense_column_types.get((collection_name, dense_name), "vector")
+
+
+def dense_operands(
+    dense_name: str,
+    dense_dim: int = config.DENSE_DIM,
+    query: sql.Composable = sql.SQL("%s"),
+    dense_type: str = "vector",
+) -> tuple[sql.Composable, sql.Composable, sql.Composable]:
+    """Return (column expression, query expression, opclass) for the column's precision."""
+    col = sql.Identifier(dense_name)
+    # A halfvec column can only be searched as halfvec, whatever DENSE_PRECISION says now;
+    # a vector column under fp16 is indexed through a halfvec expression
+    if dense_type == "halfvec" or config.DENSE_PRECISION == "fp16":
+        halfvec = sql.SQL("halfvec({})").format(sql.Literal(dense_dim))
+        return (
+            sql.SQL("({}::{})").format(col, halfvec),
+            sql.SQL("{}::{}").format(query, halfvec),
+            sql.SQL("halfvec_cosine_ops"),
+        )
+    return col, query, sql.SQL("vector_cosine_ops")
+
+
+async def _configure_conn(conn: psycopg.AsyncConnection) -> None:
+    # Runs once per physical connection; settings persist for the session
+    await register_vector_async(conn)
+    await conn.execute(
+        "SELECT set_config('hnsw.ef_search', %s, false);",
+        (str(config.HNSW_EF_SEARCH),),
+    )
+    if config.POSTGRES_WORK_MEM:
+        await conn.execute(
+            "SELECT set_config('work_mem', %s, false);",
+            (config.POSTGRES_WORK_MEM,),
+        )
+
+
+async def _open_pool() -> AsyncConnectionPool:
     params = _get_db_params()
-    conn = psycopg.connect(**params)
-    conn.autocommit = True
 
-    with conn.cursor() as cur:
-        cur.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+    # The extension must exist before pgvector types can be registered on pooled connections
+    async with await psycopg.AsyncConnection.connect(**params, autocommit=True) as conn:
+        # Concurrent CREATE OR REPLACE FUNCTION from several workers fails with
+        # "tuple concurrently updated", so starting processes take turns
+        async with conn.transaction():
+            await conn.execute(
+                "SELECT pg_advisory_xact_lock(hashtext('audio2text-rag:setup'));"
+            )
+            await conn.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+            await conn.execute(CREATE_BM25_FUNCTIONS)
+
+    pool = AsyncConnectionPool(
+        conninfo=make_conninfo(**params),
+        min_size=config.POSTGRES_POOL_MIN_SIZE,
+        max_size=config.POSTGRES_POOL_MAX_SIZE,
+        # prepare_threshold=0 prepares every statement server-side on first use
+        kwargs={"autocommit": True, "prepare_threshold": 0},
+        configure=_configure_conn,
+        open=False,
+    )
+    # Waiting for min_size avoids leaving connection attempts in flight if the loop ends
+    await pool.open(wait=True)
+    return pool
+
+
+def _release_stale_pool(
+    pool: Optional[AsyncConnectionPool], loop: Optional[asyncio.AbstractEventLoop]
+) -> None:
+    """Close a pool that was opened on an event loop other than the current one."""
+    if pool is None or pool.closed or loop is None or loop.is_closed():
+        # A closed loop has already cancelled the pool's workers
+        return
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(pool.close(), loop)
+        return
+    raise RuntimeError(
+        "The Postgres pool is still open on another event loop; "
+        "await close_pg_pool() on that loop before switching loops."
+    )
+
+
+async def get_pg_pool() -> AsyncConnectionPool:
+    global _pool, _pool_task, _pool_loop
+    loop = asyncio.get_running_loop()
+    if _pool_loop is not loop or (_pool is not None and _pool.closed):
+        if _pool_loop is not loop:
+            _release_stale_pool(_pool, _pool_loop)
+            _ensure_locks.clear()
+        _pool, _pool_task, _pool_loop = None, None, loop
+
+    if _pool is None:
+        # Concurrent first callers share one opening task instead of racing
+        if _pool_task is None:
+            _pool_task = asyncio.ensure_future(_open_pool())
+        try:
+            pool = await asyncio.shield(_pool_task)
+        except Exception:
+            _pool_task = None
+            raise
+        _pool = pool
+    return _pool
+
 
-    register_vector(conn)
-    return conn
+async def close_pg_pool() -> None:
+    """Close the shared pool; the next get_pg_pool() call opens a new one."""
+    global _pool, _pool_task, _pool_loop
+    pool, _pool, _pool_task, _pool_loop = _pool, None, None, None
+    if pool is not None and not pool.closed:
+        await pool.close()
 
 
-def ensure_collection_exists(
+@asynccontextmanager
+async def get_pg_conn() -> AsyncIterator[psycopg.AsyncConnection]:
+    pool = await get_pg_pool()
+    async with pool.connection() as conn:
+        yield conn
+
+
+async def ensure_collection_exists(
     collection_name: str,
     dense_name: str = config.DENSE_MODEL,
     dense_dim: int = config.DENSE_DIM,
     m: int = 32,
     ef_construction: int = 128,
 ) -> None:
-    conn = get_pg_conn()
+    ensured_key = (collection_name, dense_name, dense_dim)
+    if ensured_key in _ensured_collections:
+        return
+
+    # get_pg_pool first, so a loop change clears stale locks before one is taken
+    await get_pg_pool()
+    async with _ensure_locks.setdefault(collection_name, asyncio.Lock()):
+        if ensured_key in _ensured_collections:
+            return
+        await _create_collection(
+            collection_name, dense_name, dense_dim, m, ef_construction
+        )
+    _ensured_collections.add(ensured_key)
 
+
+async def _create_collection(
+    collection_name: str,
+    dense_name: str,
+    dense_dim: int,
+    m: int,
+    ef_construction: int,
+) -> None:
     df_table = f"{collection_name}_{DOC_FREQ_TABLE_SUFFIX}"
     pl_table = f"{collection_name}_{POSTINGS_LIST_TABLE_SUFFIX}"
+    vec_table = f"{collection_name}_{VECTOR_TABLE_SUFFIX}"
 
     create_main_table = sql.SQL(
         """
@@ -56,16 +237,43 @@ def ensure_collection_exists(
 			title TEXT,
 			file_name TEXT,
 			file_path TEXT,
-			{dense_col} vector({dense_dim}) NOT NULL,
             doc_len INT NOT NULL
 		);
 		"""
     ).format(
         main_table=sql.Identifier(collection_name),
+    )
+
+    # Vectors live in their own narrow table so ANN scans never touch payload rows
+    create_vec_table = sql.SQL(
+        """
+        CREATE TABLE IF NOT EXISTS {vec_table} (
+            id UUID PRIMARY KEY REFERENCES {main_table}(id) ON DELETE CASCADE,
+            {dense_col} {dense_type}({dense_dim}) NOT NULL
+        );
+        """
+    ).format(
+        vec_table=sql.Identifier(vec_table),
+        main_table=sql.Identifier(collection_name),
         dense_col=sql.Identifier(dense_name),
+        dense_type=sql.SQL("halfvec" if config.DENSE_PRECISION == "fp16" else "vector"),
         dense_dim=sql.Literal(dense_dim),
     )
 
+    # Collections created before the split keep their vectors on the main table
+    migrate_vectors = sql.SQL(
+        """
+        INSERT INTO {vec_table} (id, {dense_col})
+        SELECT id, {dense_col} FROM {main_table}
+        ON CONFLICT (id) DO NOTHING;
+        ALTER TABLE {main_table} DROP COLUMN {dense_col};
+        """
+    ).format(
+        vec_table=sql.Identifier(vec_table),
+        main_table=sql.Identifier(collection_name),
+        dense_col=sql.Identifier(dense_name),
+    )
+
     create_emb_index = sql.SQL(
         """
         CREATE INDEX IF NOT EXISTS {index} ON {table}
@@ -73,21 +281,12 @@ def ensure_collection_exists(
 		"""
     )
 
-    create_dense_index = create_emb_index.format(
-        idx_name=sql.Literal(f"{collection_name}_{dense_name}_idx"),
-        index=sql.Identifier(f"{collection_name}_{dense_name}_idx"),
-        table=sql.Identifier(collection_name),
-        col=sql.Identifier(dense_name),
-        ops=sql.SQL("vector_cosine_ops"),
-        m=sql.Literal(m),
-        ef_construction=sql.Literal(ef_construction),
-    )
-
     create_doc_freq_table = sql.SQL(
         """
         CREATE TABLE IF NOT EXISTS {df_table} (
             term TEXT PRIMARY KEY,
-            doc_freq INT NOT NULL
+            doc_freq INT NOT NULL,
+            idf DOUBLE PRECISION
         );
         """
     ).format(
@@ -100,6 +299,7 @@ def ensure_collection_exists(
             term TEXT,
             doc_id UUID,
             freq INT NOT NULL,
+            partial_bm25 DOUBLE PRECISION,
             PRIMARY KEY (term, doc_id),
             FOREIGN KEY (term) REFERENCES {df_table}(term) ON DELETE CASCADE,
             FOREIGN KEY (doc_id) REFERENCES {main_table}(id) ON DELETE CASCADE
@@ -111,34 +311,177 @@ def ensure_collection_exists(
         main_table=sql.Identifier(collection_name),
     )
 
+    # Covering indexes let the BM25 joins and stats refresh run as index-only scans
     create_term_index = sql.SQL(
         """
-        CREATE INDEX IF NOT EXISTS {term_index} ON {pl_table} (term);
+        CREATE INDEX IF NOT EXISTS {term_index} ON {pl_table} (term)
+        INCLUDE (doc_id, freq, partial_bm25);
+        DROP INDEX IF EXISTS {legacy_term_index};
+        CREATE INDEX IF NOT EXISTS {doc_len_index} ON {main_table} (id)
+        INCLUDE (doc_len);
+        """
+    ).format(
+        term_index=sql.Identifier(f"{pl_table}_term_cov_idx"),
+        legacy_term_index=sql.Identifier(f"{pl_table}_term_idx"),
+        doc_len_index=sql.Identifier(f"{collection_name}_doc_len_idx"),
+        pl_table=sql.Identifier(pl_table),
+        main_table=sql.Identifier(collection_name),
+    )
+
+    # Collections created before precomputed scores existed need the columns and a backfill
+    add_score_columns = sql.SQL(
+        """
+        ALTER TABLE {df_table} ADD COLUMN IF NOT EXISTS idf DOUBLE PRECISION;
+        ALTER TABLE {pl_table} ADD COLUMN IF NOT EXISTS partial_bm25 DOUBLE PRECISION;
         """
     ).format(
-        term_index=sql.Identifier(
-            f"{collection_name}_{POSTINGS_LIST_TABLE_SUFFIX}_term_idx"
-        ),
+        df_table=sql.Identifier(df_table),
         pl_table=sql.Identifier(pl_table),
     )
 
-    with conn.cursor() as cur:
-        cur.execute(create_main_table)
-        cur.execute(create_dense_index)
-        cur.execute(create_doc_freq_table)
-        cur.execute(create_postings_list_table)
-        cur.execute(create_term_index)
+    column_exists = """
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = %s AND column_name = %s;
+        """
+
+    async with get_pg_conn() as conn:
+        # Other processes may be creating or migrating the same collection; the lock
+        # matches upsert_data's, so DDL never interleaves with a batch write either
+        async with conn.transaction(), conn.cursor() as cur:
+            await cur.execute(
+                "SELECT pg_advisory_xact_lock(hashtext(%s));", (collection_name,)
+            )
+            await cur.execute(column_exists, (pl_table, "partial_bm25"))
+            needs_backfill = await cur.fetchone() is None
+
+            await cur.execute(create_main_table)
+            await cur.execute(create_vec_table)
+
+            await cur.execute(column_exists, (collection_name, dense_name))
+            if await cur.fetchone() is not None:
+                await cur.execute(migrate_vectors, prepare=False)
+
+            # Collections created under another DENSE_PRECISION keep their column type,
+            # and the index opclass follows the stored type
+            await cur.execute(
+                """
+                SELECT udt_name FROM information_schema.columns
+                WHERE table_name = %s AND column_name = %s;
+                """,
+                (vec_table, dense_name),
+            )
+            (dense_type,) = await cur.fetchone()
+            _dense_column_types[(collection_name, dense_name)] = dense_type
+
+            # halfvec search goes through a (col::halfvec) expression: a no-op cast on
+            # halfvec columns, and a half-precision index over vector columns
+            dense_col, _, dense_ops = dense_operands(
+                dense_name, dense_dim, dense_type=dense_type
+            )
+            is_half = dense_type == "halfvec" or config.DENSE_PRECISION == "fp16"
+            dense_index = (
+                f"{collection_name}_{dense_name}_{'fp16_idx' if is_half else 'idx'}"
+            )
+            await cur.execute(
+                create_emb_index.format(
+                    index=sql.Identifier(dense_index),
+                    table=sql.Identifier(vec_table),
+                    col=dense_col,
+                    ops=dense_ops,
+                    m=sql.Literal(m),
+                    ef_construction=sql.Literal(ef_construction),
+                )
+            )
+            await cur.execute(create_doc_freq_table)
+            await cur.execute(create_postings_list_table)
+
+            if needs_backfill:
+                await cur.execute(add_score_columns, prepare=False)
+                await refresh_sparse_stats(conn, collection_name)
+
+            await cur.execute(create_term_index, prepare=False)
+
+        # Load the HNSW graph into shared buffers so the first searches skip disk reads
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute("CREATE EXTENSION IF NOT EXISTS pg_prewarm;")
+                await cur.execute(
+                    "SELECT pg_prewarm(%s::regclass);",
+                    (sql.Identifier(dense_index).as_string(conn),),
+                )
+        except psycopg.Error as e:
+            logger.warning(f"pg_prewarm of {dense_index} skipped: {e}")
+
+
+async def refresh_sparse_stats(
+    conn: psycopg.AsyncConnection, collection_name: str, only_missing: bool = False
+) -> None:
+    """Recompute doc_freq, idf and partial_bm25 from the stored postings.
 
+    With only_missing, only rows whose idf/partial_bm25 is still NULL are filled,
+    from the current N and avg_dl; existing rows keep their (slightly stale) values.
+    """
+    main_table = sql.Identifier(collection_name)
+    df_table = sql.Identifier(f"{collection_name}_{DOC_FREQ_TABLE_SUFFIX}")
+    pl_table = sql.Identifier(f"{collection_name}_{POSTINGS_LIST_TABLE_SUFFIX}")
 
-def upsert_data(
+    # doc_freq is derived from postings so batches accumulate instead of overwriting
+    update_doc_freq = sql.SQL(
+        """
+        UPDATE {df_table} d
+        SET doc_freq = c.doc_freq
+        FROM (
+            SELECT term, COUNT(*)::int AS doc_freq FROM {pl_table} GROUP BY term
+        ) c
+        WHERE d.term = c.term AND d.doc_freq <> c.doc_freq;
+        """
+    ).format(df_table=df_table, pl_table=pl_table)
+
+    missing_idf = sql.SQL("WHERE idf IS NULL" if only_missing else "")
+    update_idf = sql.SQL(
+        """
+        UPDATE {df_table}
+        SET idf = bm25_idf(doc_freq, s.n)
+        FROM (SELECT COUNT(*)::int AS n FROM {main_table}) s
+        {missing_idf};
+        """
+    ).format(df_table=df_table, main_table=main_table, missing_idf=missing_idf)
+
+    missing_bm25 = sql.SQL("AND p.partial_bm25 IS NULL" if only_missing else "")
+    update_partial_bm25 = sql.SQL(
+        """
+        UPDATE {pl_table} p
+        SET partial_bm25 = bm25_tf(p.freq, m.doc_len, s.avg_dl)
+        FROM {main_table} m,
+             (SELECT AVG(doc_len)::float8 AS avg_dl FROM {main_table}) s
+        WHERE m.id = p.doc_id {missing_bm25};
+        """
+    ).format(pl_table=pl_table, main_table=main_table, missing_bm25=missing_bm25)
+
+    async with conn.cursor() as cur:
+        # New terms arrive with their exact doc_freq; existing ones catch up in full runs
+        if not only_missing:
+            await cur.execute(update_doc_freq)
+        await cur.execute(update_idf)
+        await cur.execute(update_partial_bm25)
+
+
+async def upsert_data(
     nodes: list[BaseNode],
-    dense_embeddings: list[list[float]],
+    dense_embeddings: np.ndarray,
     postings_list: dict[str, schemas.TermEntry],
     doc_lens: dict[str, int],
     collection_name: str,
     dense_name: str = config.DENSE_MODEL,
     dense_dim: int = config.DENSE_DIM,
+    vacuum: bool = True,
 ) -> None:
+    """Write one batch of documents and its BM25 stats in the same transaction.
+
+    Pass vacuum=False for all but the last batch of a multi-batch ingest: those
+    only fill the stats of their new rows, while the last batch refreshes every
+    row and vacuums.
+    """
     if not nodes:
         raise ValueError("No nodes provided for upserting")
 
@@ -147,78 +490,107 @@ def upsert_data(
             f"The number of dense embeddings ({len(dense_embeddings)}) must match the number of nodes ({len(nodes)})"
         )
 
-    conn = get_pg_conn()
-    ensure_collection_exists(
+    await ensure_collection_exists(
         collection_name=collection_name,
         dense_name=dense_name,
         dense_dim=dense_dim,
     )
 
-    insert_main_table = sql.SQL(
+    df_table = sql.Identifier(f"{collection_name}_{DOC_FREQ_TABLE_SUFFIX}")
+
+    copy_main_table = sql.SQL(
+        """
+        COPY {table} (id, text, document_id, title, file_name, file_path, doc_len)
+        FROM STDIN (FORMAT BINARY)
         """
-		INSERT INTO {table} (id, text, document_id, title, file_name, file_path, {dense_col}, doc_len)
-		VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        --ON CONFLICT (id) DO UPDATE SET
-        --	text = EXCLUDED.text,
-        --	document_id = EXCLUDED.document_id,
-        --	title = EXCLUDED.title,
-        --	file_name = EXCLUDED.file_name,
-        --	file_path = EXCLUDED.file_path,
-        --	{dense_col} = EXCLUDED.{dense_col};
-		"""
     ).format(
         table=sql.Identifier(collection_name),
+    )
+
+    copy_vec_table = sql.SQL(
+        """
+        COPY {vec_table} (id, {dense_col}) FROM STDIN (FORMAT BINARY)
+        """
+    ).format(
+        vec_table=sql.Identifier(f"{collection_name}_{VECTOR_TABLE_SUFFIX}"),
         dense_col=sql.Identifier(dense_name),
     )
 
+    # COPY cannot skip existing terms, so df rows go through a staging table
+    create_df_stage = sql.SQL(
+        """
+        CREATE TEMP TABLE {stage} (term TEXT, doc_freq INT) ON COMMIT DROP;
+        """
+    ).format(stage=sql.Identifier(_DF_STAGE_TABLE))
+
+    copy_df_stage = sql.SQL(
+        """
+        COPY {stage} (term, doc_freq) FROM STDIN (FORMAT BINARY)
+        """
+    ).format(stage=sql.Identifier(_DF_STAGE_TABLE))
+
     insert_df_table = sql.SQL(
         """
         INSERT INTO {df_table} (term, doc_freq)
-        VALUES (%s, %s)
-        ON CONFLICT (term) DO UPDATE SET
-            doc_freq = EXCLUDED.doc_freq;
+        SELECT term, doc_freq FROM {stage}
+        ON CONFLICT (term) DO NOTHING;
         """
     ).format(
-        df_table=sql.Identifier(f"{collection_name}_{DOC_FREQ_TABLE_SUFFIX}"),
+        df_table=df_table,
+        stage=sql.Identifier(_DF_STAGE_TABLE),
     )
 
-    insert_pl_table = sql.SQL(
+    copy_pl_table = sql.SQL(
         """
-        INSERT INTO {pl_table} (term, doc_id, freq)
-        VALUES (%s, %s, %s)
-        --ON CONFLICT (term, doc_id) DO UPDATE SET
-        --  freq = EXCLUDED.freq;
+        COPY {pl_table} (term, doc_id, freq) FROM STDIN (FORMAT BINARY)
         """
     ).format(
         pl_table=sql.Identifier(f"{collection_name}_{POSTINGS_LIST_TABLE_SUFFIX}"),
     )
 
+    dense_type = get_dense_column_type(collection_name, dense_name)
+    vector_cls = HalfVector if dense_type == "halfvec" else Vector
+    main_copy_types = [
+        "uuid",
+        "text",
+        "text",
+        "text",
+        "text",
+        "text",
+        "int4",
+    ]
+    vec_copy_types = ["uuid", dense_type]
+
+    vacuum_tables = sql.SQL("VACUUM (ANALYZE) {}, {}, {}, {};").format(
+        sql.Identifier(collection_name),
+        sql.Identifier(f"{collection_name}_{VECTOR_TABLE_SUFFIX}"),
+        df_table,
+        sql.Identifier(f"{collection_name}_{POSTINGS_LIST_TABLE_SUFFIX}"),
+    )
+
     main_rows = []
+    vec_rows = []
     df_rows = []
     pl_rows = []
 
     # prepare main table rows
     for i, node in enumerate(nodes):
-        payload = schemas.DocumentPayload(
-            text=node.text,
-            metadata=schemas.DocumentMetadata.model_validate(node.metadata),
-        )
-
-        dense_vec = Vector(dense_embeddings[i])
-        doc_len = doc_lens.get(node.id_, 0)
+        # Metadata has the schemas.DocumentMetadata fields (built in process_documents)
+        metadata = node.metadata
+        node_id = UUID(node.id_)
 
         main_rows.append(
             (
-                UUID(node.id_),
-                payload.text,
-                payload.metadata.document_id,
-                payload.metadata.title,
-                payload.metadata.file_name,
-                payload.metadata.file_path,
-                dense_vec,
-                doc_len,
+                node_id,
+                node.text,
+                metadata.get("document_id"),
+                metadata.get("title"),
+                metadata.get("file_name"),
+                metadata.get("file_path"),
+                doc_lens.get(node.id_, 0),
             )
         )
+        vec_rows.append((node_id, vector_cls(dense_embeddings[i])))
 
     # prepare postings list and document frequency rows
     for term, term_entry in postings_list.items():
@@ -237,7 +609,41 @@ def upsert_data(
                 )
             )
 
-    with conn.cursor() as cur:
-        cur.executemany(insert_main_table, main_rows)
-        cur.executemany(insert_df_table, df_rows)
-        cur.executemany(insert_pl_table, pl_rows)
+    async with get_pg_conn() as conn, conn.transaction():
+        # Serialize writers per collection; the stats refresh rewrites every row
+        await conn.execute(
+            "SELECT pg_advisory_xact_lock(hashtext(%s));", (collection_name,)
+        )
+        async with conn.cursor() as cur:
+            async with cur.copy(copy_main_table) as copy:
+                copy.set_types(main_copy_types)
+                for row in main_rows:
+                    await copy.write_row(row)
+
+            async with cur.copy(copy_vec_table) as copy:
+                copy.set_types(vec_copy_types)
+                for row in vec_rows:
+                    await copy.write_row(row)
+
+            # The staging table is recreated per transaction, so don't prepare against it
+            await cur.execute(create_df_stage, prepare=False)
+            async with cur.copy(copy_df_stage) as copy:
+                copy.set_types(_DF_COPY_TYPES)
+                for row in df_rows:
+                    await copy.write_row(row)
+            await cur.execute(insert_df_table, prepare=False)
+
+            async with cur.copy(copy_pl_table) as copy:
+                copy.set_types(_PL_COPY_TYPES)
+                for row in pl_rows:
+                    await copy.write_row(row)
+        # Committed rows must never carry NULL idf/partial_bm25
+        await refresh_sparse_stats(conn, collection_name, only_missing=not vacuum)
+
+    # The refresh rewrites every postings row; reclaim them and keep the visibility
+    # map current so the covering indexes stay index-only
+    if vacuum:
+        async with get_pg_conn() as conn:
+            await conn.execute(vacuum_tables, prepare=False)
+
+    _collection_versions[collection_name] = get_collection_version(collection_name) + 1
@@ -10,6 +10,12 @@ QUESTION:
 {query}
 """
 
+# Template split once at import so prompts are built by concatenation
+_PROMPT_PREFIX, _PROMPT_MIDDLE, _PROMPT_SUFFIX = prompt_template.replace(
+    "{query}", "{context}"
+).split("{context}")
+_EMPTY_CONTEXT_PREFIX = _PROMPT_PREFIX + _PROMPT_MIDDLE
+
 
 def get_augmented_prompts(
     queries: list[str], contexts: list[list[schemas.RetrievedDocument]]
@@ -19,17 +25,20 @@ def get_augmented_prompts(
             "The number of queries must match the number of context lists."
         )
 
-    formatted_contexts = [
-        "\n".join(
-            f"- {doc.payload.text} (Source: {doc.payload.metadata.title})"
-            for doc in context
-        )
-        for context in contexts
-    ]
-
     augmented_prompts = [
-        prompt_template.format(context=context, query=query)
-        for query, context in zip(queries, formatted_contexts)
+        (
+            _PROMPT_PREFIX
+            + "\n".join(
+                f"- {doc.payload.text} (Source: {doc.payload.metadata.title})"
+                for doc in context
+            )
+            + _PROMPT_MIDDLE
+            if context
+            else _EMPTY_CONTEXT_PREFIX
+        )
+        + query
+        + _PROMPT_SUFFIX
+        for query, context in zip(queries, contexts)
     ]
 
     return augmented_prompts
@@ -1,26 +1,73 @@
+import asyncio
+import hashlib
 from functools import lru_cache
-from cerebras.cloud.sdk import Cerebras
+from typing import Literal
+from cerebras.cloud.sdk import (
+    AsyncCerebras,
+    APIConnectionError,
+    InternalServerError,
+    RateLimitError,
+)
 from src.core import config
-from src.utils import logger
+from src.utils import logger, retry_async, SQLiteCache
+
+# Rate limits, 5xx and dropped connections are transient; other API errors are not
+_RETRYABLE_ERRORS = (RateLimitError, InternalServerError, APIConnectionError)
 
 
 @lru_cache(maxsize=1)
-def _get_client() -> Cerebras:
+def _get_client() -> AsyncCerebras:
     if not config.CEREBRAS_API_KEY:
         raise RuntimeError("CEREBRAS_API_KEY not set")
     logger.info("Initializing Cerebras LLM client")
-    client = Cerebras(api_key=config.CEREBRAS_API_KEY)
+    # retry_async owns the retry policy; SDK retries would multiply the attempts
+    client = AsyncCerebras(api_key=config.CEREBRAS_API_KEY, max_retries=0)
     return client
 
 
-def generate(prompts: list[str], model: str) -> list[str]:
-    client: Cerebras = _get_client()
-    messages_list = [[{"role": "user", "content": prompt}] for prompt in prompts]
+@lru_cache(maxsize=1)
+def _get_response_cache() -> SQLiteCache | None:
+    if not config.LLM_CACHE_PATH:
+        return None
+    logger.info(f"Caching LLM responses in {config.LLM_CACHE_PATH}")
+    return SQLiteCache(config.LLM_CACHE_PATH)
+
+
+def _cache_key(model: str, reasoning_effort: str, prompt: str) -> str:
+    return hashlib.blake2b(
+        f"{model}\0{reasoning_effort}\0{prompt}".encode(), digest_size=16
+    ).hexdigest()
+
+
+async def generate(
+    prompts: list[str],
+    model: str,
+    reasoning_effort: Literal["low", "medium", "high"] = "high",
+) -> list[str]:
+    client: AsyncCerebras = _get_client()
+    cache = _get_response_cache()
+
+    # Requests are I/O bound; cap how many are in flight at the provider at once
+    semaphore = asyncio.Semaphore(config.LLM_CONCURRENCY)
+
+    async def _complete(prompt: str) -> str:
+        key = _cache_key(model, reasoning_effort, prompt)
+        if cache is not None and (cached := cache.get(key)) is not None:
+            return cached
+
+        messages = [{"role": "user", "content": prompt}]
+        async with semaphore:
+            response = await retry_async(
+                lambda: client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    reasoning_effort=reasoning_effort,
+                ),
+                retry_on=_RETRYABLE_ERRORS,
+            )
+        content = response.choices[0].message.content
+        if cache is not None and content is not None:
+            cache.put(key, content)
+        return content
 
-    responses = []
-    for messages in messages_list:
-        response = client.chat.completions.create(
-            model=model, messages=messages, reasoning_effort="high"
-        )
-        responses.append(response.choices[0].message.content)
-    return responses
+    return list(await asyncio.gather(*(_complete(p) for p in prompts)))
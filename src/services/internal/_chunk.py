@@ -1,11 +1,11 @@
 import os
 import asyncio
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 from typing import Literal
 from functools import lru_cache
 from src.core import config
-from src.utils import logger
+from src.utils import logger, retry_async
 
 MODEL_ID = "gemini-flash-latest"
 
@@ -82,17 +82,21 @@ def _get_client() -> genai.Client:
 
 
 _semaphore = None
-limit = 5
 
 
 def _get_semaphore():
     """Lazy-init a semaphore to cap outbound concurrency and avoid rate limits."""
-    global _semaphore, limit
+    global _semaphore
     if _semaphore is None:
-        _semaphore = asyncio.Semaphore(limit)
+        _semaphore = asyncio.Semaphore(config.GEMINI_CONCURRENCY)
     return _semaphore
 
 
+def _is_transient(e: BaseException) -> bool:
+    # Server errors and rate limits; other client errors won't succeed on retry
+    return isinstance(e, errors.ServerError) or getattr(e, "code", None) == 429
+
+
 def parse_response_into_chunks(
     response_text: str, text_type: Literal["transcript", "document"] = "transcript"
 ) -> list[tuple[str, str]]:
@@ -164,11 +168,14 @@ async def chunk_text(
         )
         sem = _get_semaphore()
         async with sem:
-            response = await asyncio.to_thread(
-                client.models.generate_content,
-                model=MODEL_ID,
-                contents=prompt,
-                config=model_config,
+            response = await retry_async(
+                lambda: client.aio.models.generate_content(
+                    model=MODEL_ID,
+                    contents=prompt,
+                    config=model_config,
+                ),
+                retry_on=(errors.APIError,),
+                retry_if=_is_transient,
             )
 
         if response is None or response.text is None:
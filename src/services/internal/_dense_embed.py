@@ -1,16 +1,34 @@
+import threading
 import torch
+import numpy as np
+from contextlib import nullcontext
 from functools import lru_cache
 from typing import Literal
 from sentence_transformers import SentenceTransformer
 from src.core import config
-from src.utils import logger
+from src.utils import logger, LRUCache
+
+# Query vectors by (text, dim); repeated queries skip the encoder entirely
+_query_cache = LRUCache(maxsize=config.DENSE_QUERY_CACHE_SIZE)
+
+# Ingest encodes in a worker thread while queries encode on the event loop; moving
+# weights between devices must not overlap another caller's forward pass
+_offload_lock = threading.Lock()
 
 
 @lru_cache(maxsize=1)
 def _get_embedding_model() -> SentenceTransformer:
     logger.info(f"Loading dense embedding model: {config.DENSE_MODEL}")
+    # Half precision only pays off on GPU; bf16 because EmbeddingGemma overflows in fp16
+    model_kwargs = {}
+    if torch.cuda.is_available() and torch.cuda.is_bf16_supported():
+        model_kwargs["torch_dtype"] = torch.bfloat16
+    # Loaded straight onto the GPU and kept there unless DENSE_UNLOAD is set
+    device = "cuda" if torch.cuda.is_available() and not config.DENSE_UNLOAD else "cpu"
     model = SentenceTransformer(
-        model_name_or_path=config.DENSE_MODEL_PATH, device="cpu"
+        model_name_or_path=config.DENSE_MODEL_PATH,
+        device=device,
+        model_kwargs=model_kwargs,
     )
     return model
 
@@ -20,48 +38,80 @@ def dense_encode(
     texts: list[str],
     titles: list[str] = [],
     dim: int = config.DENSE_DIM,
-    batch_size: int = 8,
-) -> list[list[float]]:
+    batch_size: int = config.DENSE_BATCH_SIZE,
+) -> np.ndarray:
 
-    device = "cuda" if torch.cuda.is_available() else "cpu"
+    if text_type == "query":
+        rows = [_query_cache.get((text, dim)) for text in texts]
+        # Only unseen texts go through the model, each once per call
+        missing = list(dict.fromkeys(t for t, row in zip(texts, rows) if row is None))
+        if missing:
+            encoded = _encode(text_type, texts=missing, dim=dim, batch_size=batch_size)
+            fresh = {text: row.copy() for text, row in zip(missing, encoded)}
+            for text, row in fresh.items():
+                _query_cache.put((text, dim), row)
+            rows = [fresh[t] if row is None else row for t, row in zip(texts, rows)]
+        if not rows:
+            return np.empty((0, dim), dtype=np.float32)
+        return np.stack(rows)
+
+    return _encode(
+        text_type, texts=texts, titles=titles, dim=dim, batch_size=batch_size
+    )
+
+
+def _encode(
+    text_type: Literal["document", "query"],
+    texts: list[str],
+    titles: list[str] = [],
+    dim: int = config.DENSE_DIM,
+    batch_size: int = config.DENSE_BATCH_SIZE,
+) -> np.ndarray:
     model = _get_embedding_model()
-    model = model.to(device=device)
 
-    embeddings: torch.Tensor = torch.Tensor([])
+    with _offload_lock if config.DENSE_UNLOAD else nullcontext():
+        # A resident model is already on its device; only offloaded weights move
+        if config.DENSE_UNLOAD and torch.cuda.is_available():
+            model = model.to(device="cuda")
 
-    if text_type == "query":
-        # Add the provided prefix to the texts
-        processed_prompts = [f"task: search result | query: {text}" for text in texts]
-
-        embeddings = model.encode_query(
-            sentences=processed_prompts,
-            truncate_dim=dim,
-            batch_size=batch_size,
-            convert_to_tensor=True,
-        )
-    elif text_type == "document":
-        if len(titles) != len(texts):
-            raise ValueError("titles and texts must have the same length")
-
-        # Add the provided prefix to the texts
-        processed_prompts = [
-            f"title: {title} | text: {text}" for text, title in zip(texts, titles)
-        ]
-
-        embeddings = model.encode_document(
-            sentences=processed_prompts,
-            truncate_dim=dim,
-            batch_size=batch_size,
-            convert_to_tensor=True,
-        )
-    else:
-        raise ValueError(f"Unsupported text_type: {text_type}")
-
-    final_embeddings = embeddings.cpu().tolist()
-
-    # move to cpu to save gpu memory
-    if model.device.type == "cuda":
-        model = model.to(device="cpu")
-        torch.cuda.empty_cache()
+        embeddings: torch.Tensor = torch.Tensor([])
+
+        if text_type == "query":
+            # Add the provided prefix to the texts
+            processed_prompts = [
+                f"task: search result | query: {text}" for text in texts
+            ]
+
+            embeddings = model.encode_query(
+                sentences=processed_prompts,
+                truncate_dim=dim,
+                batch_size=batch_size,
+                convert_to_tensor=True,
+            )
+        elif text_type == "document":
+            if len(titles) != len(texts):
+                raise ValueError("titles and texts must have the same length")
+
+            # Add the provided prefix to the texts
+            processed_prompts = [
+                f"title: {title} | text: {text}" for text, title in zip(texts, titles)
+            ]
+
+            embeddings = model.encode_document(
+                sentences=processed_prompts,
+                truncate_dim=dim,
+                batch_size=batch_size,
+                convert_to_tensor=True,
+            )
+        else:
+            raise ValueError(f"Unsupported text_type: {text_type}")
+
+        # float32 rows for pgvector; no per-element Python floats
+        final_embeddings = embeddings.float().cpu().numpy()
+
+        # move to cpu to save gpu memory
+        if config.DENSE_UNLOAD and model.device.type == "cuda":
+            model = model.to(device="cpu")
+            torch.cuda.empty_cache()
 
     return final_embeddings
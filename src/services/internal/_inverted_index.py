@@ -1,4 +1,4 @@
-from collections import Counter
+from collections import Counter, defaultdict
 from src import schemas
 from src.utils import tokenize
 
@@ -9,25 +9,25 @@ def build_inverted_index(
 ) -> tuple[dict[str, schemas.TermEntry], dict[str, int]]:
     """Returns postings list and document lengths for the given texts."""
 
-    postings_list: dict[str, schemas.TermEntry] = {}
+    postings: defaultdict[str, list[schemas.PostingEntry]] = defaultdict(list)
     doc_lens: dict[str, int] = {}
 
     tokenized_docs = tokenize(texts=texts)
 
-    # creating postings list
+    # creating postings list; entries are built from trusted counts, so skip validation
     for doc_id, tokens in zip(doc_ids, tokenized_docs):
-        term_counts = Counter(tokens)
-        for token, term_freq in term_counts.items():
-            doc_lens[doc_id] = doc_lens.get(doc_id, 0) + term_freq
-            if token not in postings_list:
-                postings_list[token] = schemas.TermEntry(doc_freq=0, postings=[])
-
-            postings_list[token].postings.append(
-                schemas.PostingEntry(doc_id=doc_id, term_freq=term_freq)
+        doc_lens[doc_id] = len(tokens)
+        for token, term_freq in Counter(tokens).items():
+            postings[token].append(
+                schemas.PostingEntry.model_construct(doc_id=doc_id, term_freq=term_freq)
             )
 
-    # compute document frequencies
-    for term, term_entry in postings_list.items():
-        postings_list[term].doc_freq = len(term_entry.postings)
+    # document frequency is the number of postings per term
+    postings_list: dict[str, schemas.TermEntry] = {
+        term: schemas.TermEntry.model_construct(
+            doc_freq=len(term_postings), postings=term_postings
+        )
+        for term, term_postings in postings.items()
+    }
 
     return postings_list, doc_lens
@@ -1,7 +1,8 @@
+import os
 import uuid
 import re
 import asyncio
-from src import schemas
+from functools import lru_cache
 from pathlib import Path
 from llama_index.core import SimpleDirectoryReader
 from llama_index.core.node_parser import SentenceSplitter
@@ -12,28 +13,35 @@ from ._chunk import chunk_text
 splitter = SentenceSplitter(chunk_size=512, chunk_overlap=64)
 
 
-_TIMESTAMP_LINE_RE = re.compile(
-    r"^\s*\[(\d+(?:\.\d+)?)s\s*-\s*(\d+(?:\.\d+)?)s\]\s+.+$"
-)
+_TIMESTAMP_LINE_RE = re.compile(rb"^\s*\[\d+(?:\.\d+)?s\s*-\s*\d+(?:\.\d+)?s\]\s+\S")
 
 
-def _is_transcript_file(filepath: str) -> bool:
+@lru_cache(maxsize=4096)
+def _sniff_transcript(filepath: str, mtime_ns: int, size: int) -> bool:
+    """Classify a file; the stat fields only key the cache so edits invalidate it."""
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            # Check up to the first 10 lines to find the first non-empty line
-            for _ in range(10):
-                line = f.readline()
-                if line == "":  # EOF
-                    break
-                s = line.strip()
-                if not s:
-                    continue
-                return bool(_TIMESTAMP_LINE_RE.match(s))
+        # One read is enough to see the first lines of any transcript
+        with open(filepath, "rb") as f:
+            head = f.read(4096)
     except Exception as e:
         raise RuntimeError(f"Error reading file {filepath}: {e}")
+
+    # Check up to the first 10 lines to find the first non-empty line
+    for line in head.splitlines()[:10]:
+        s = line.strip()
+        if s:
+            return _TIMESTAMP_LINE_RE.match(s) is not None
     return False
 
 
+def _is_transcript_file(filepath: str) -> bool:
+    try:
+        st = os.stat(filepath)
+    except Exception as e:
+        raise RuntimeError(f"Error reading file {filepath}: {e}")
+    return _sniff_transcript(filepath, st.st_mtime_ns, st.st_size)
+
+
 async def process_documents(file_paths: list[str], file_dir: str) -> list[TextNode]:
 
     reader = SimpleDirectoryReader(input_files=file_paths, input_dir=file_dir)
@@ -65,18 +73,20 @@ async def process_documents(file_paths: list[str], file_dir: str) -> list[TextNo
         try:
             if chunks == []:
                 raise ValueError("No chunks returned from chunking process")
-            for title, chunk in chunks:
-                node_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{title}_{audio_url}"))
-
-                metadata = schemas.DocumentMetadata(
-                    document_id=audio_url,
-                    title=title,
-                    file_name=audio_title,
-                    file_path=filepath,
+            # Same fields and order as schemas.DocumentMetadata.model_dump()
+            nodes.extend(
+                TextNode(
+                    id_=str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{title}_{audio_url}")),
+                    text=chunk,
+                    metadata={
+                        "document_id": audio_url,
+                        "title": title,
+                        "file_name": audio_title,
+                        "file_path": filepath,
+                    },
                 )
-
-                node = TextNode(id_=node_id, text=chunk, metadata=metadata.model_dump())
-                nodes.append(node)
+                for title, chunk in chunks
+            )
         except Exception as e:
             print(f"Error processing chunks for {audio_title}: {e}")
             continue
@@ -1,5 +1,6 @@
 import torch
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from functools import lru_cache
 from typing import Union
@@ -7,6 +8,9 @@ from src.core import config
 from src.utils import logger
 from faster_whisper import WhisperModel, BatchedInferencePipeline
 
+# One transcript line per segment: "[start - end] text"
+_SEG_FMT = "[{:.2f}s - {:.2f}s] {}\n".format
+
 
 @lru_cache(maxsize=1)
 def _get_s2t_batched_model() -> BatchedInferencePipeline:
@@ -27,6 +31,25 @@ def _ensure_list(paths: Union[str, list[str]]) -> list[str]:
     return paths
 
 
+def _transcribe_one(
+    batched_model: BatchedInferencePipeline,
+    audio_path: str,
+    language: str,
+    batch_size: int,
+) -> str:
+    logger.info(f"Transcribing audio file: {audio_path}")
+
+    # segments is lazy; inference runs while it is consumed
+    segments, info = batched_model.transcribe(
+        audio_path, language=language, batch_size=batch_size
+    )
+
+    return "".join(
+        _SEG_FMT(segment.start, segment.end, segment.text.strip())
+        for segment in segments
+    )
+
+
 def transcribe_audio(
     audio_paths: Union[str, list[str]],
     out_dir: str = config.TRANSCRIPT_STORAGE_PATH,
@@ -40,40 +63,42 @@ def transcribe_audio(
         return []
 
     batched_model = _get_s2t_batched_model()
-    batched_model.model.model.load_model()
+    # Weights stay on the device between calls unless SPEECH2TEXT_UNLOAD is set
+    if not batched_model.model.model.model_is_loaded:
+        batched_model.model.model.load_model()
 
     os.makedirs(out_dir, exist_ok=True)
 
-    transcripts = []
-    filepaths = []
-    for audio_path in audio_paths:
-        try:
-            logger.info(f"Transcribing audio file: {audio_path}")
-
-            segments, info = batched_model.transcribe(
-                audio_path, language=language, batch_size=batch_size
-            )
-
-            transcript = ""
-            for segment in segments:
-                s, e, t = segment.start, segment.end, segment.text.strip()
-                transcript += f"[{s:.2f}s - {e:.2f}s] {t}\n"
-
-            # Write out the transcript
-            audio_filename = Path(audio_path).stem
-            transcript_path = os.path.join(out_dir, f"{audio_filename}.txt")
-            with open(transcript_path, "w", encoding="utf-8") as f:
-                f.write(transcript)
-
-            filepaths.append(transcript_path)
-
-            logger.info(f"Completed saving transcription for: {audio_path}")
-        except Exception as e:
-            logger.error(f"Error transcribing {audio_path}: {e}")
-            transcripts.append("")
-            continue
-
-    if batched_model.model.model.device == "cuda":
+    # CTranslate2 releases the GIL, so decoding one file overlaps inference on another
+    device = batched_model.model.model.device
+    max_workers = 2 if device == "cuda" else min(4, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(audio_paths))) as executor:
+        futures = [
+            executor.submit(_transcribe_one, batched_model, path, language, batch_size)
+            for path in audio_paths
+        ]
+
+        transcripts = []
+        filepaths = []
+        for audio_path, future in zip(audio_paths, futures):
+            try:
+                transcript = future.result()
+
+                # Write out the transcript
+                audio_filename = Path(audio_path).stem
+                transcript_path = os.path.join(out_dir, f"{audio_filename}.txt")
+                with open(transcript_path, "w", encoding="utf-8") as f:
+                    f.write(transcript)
+
+                filepaths.append(transcript_path)
+
+                logger.info(f"Completed saving transcription for: {audio_path}")
+            except Exception as e:
+                logger.error(f"Error transcribing {audio_path}: {e}")
+                transcripts.append("")
+                continue
+
+    if config.SPEECH2TEXT_UNLOAD and batched_model.model.model.device == "cuda":
         batched_model.model.model.unload_model()
         torch.cuda.empty_cache()
 
@@ -1,5 +1,4 @@
 from src import schemas
-import re
 
 prompt_template = """
 You are an expert in summarizing IT-related documents. Follow these rules exactly and produce **only** the requested output — no explanations or extra text.
@@ -34,20 +33,24 @@ Now process the provided documents according to the rules above:
 """
 
 
+# The fixed parameters are filled once; only the documents vary per prompt
+_PROMPT_PREFIX, _PROMPT_SUFFIX = (
+    prompt_template.replace("{max_sum_len}", "50")
+    .replace("{min_len_to_sum}", "100")
+    .replace("{lang}", "vi")
+    .split("{documents}")
+)
+
+
 def get_summarization_prompts(
     documents_list: list[list[str]],
 ) -> list[str]:
-    prompts: list[str] = []
-    for documents in documents_list:
-        doc_texts = [f"{i + 1}. " + d for i, d in enumerate(documents)]
-        prompt = prompt_template.format(
-            documents="\n\n==========\n".join(doc_texts),
-            max_sum_len=50,
-            min_len_to_sum=100,
-            lang="vi",
-        )
-        prompts.append(prompt)
-    return prompts
+    return [
+        _PROMPT_PREFIX
+        + "\n\n==========\n".join(f"{i + 1}. {d}" for i, d in enumerate(documents))
+        + _PROMPT_SUFFIX
+        for documents in documents_list
+    ]
 
 
 def parse_summarization_responses(
@@ -61,12 +64,9 @@ def parse_summarization_responses(
         )
 
     separator = "\n=========="
-    sep_pattern = re.compile(separator, flags=re.MULTILINE)
 
     for i, (response, docs) in enumerate(zip(responses, documents_list)):
-        summaries = [
-            seg.strip() for seg in re.split(sep_pattern, response) if seg.strip() != ""
-        ]
+        summaries = [seg.strip() for seg in response.split(separator) if seg.strip()]
 
         if len(summaries) != len(docs):
             raise ValueError(
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import status
 from src import schemas
 from src.services.internal import (
@@ -22,7 +23,7 @@ async def generate_responses(
             contexts=retrieved_docs,
         )
 
-        qa_responses = generate(
+        qa_coro = generate(
             prompts=qa_prompts,
             model=request.model_name,
         )
@@ -36,13 +37,24 @@ async def generate_responses(
 
             sum_prompts = get_summarization_prompts(documents_list=documents_text)
 
-            sum_responses = generate(prompts=sum_prompts, model=request.model_name)
+            # QA and summarization are independent, so both LLM batches run at once.
+            # Summaries follow a fixed format and don't need deep reasoning
+            qa_responses, sum_responses = await asyncio.gather(
+                qa_coro,
+                generate(
+                    prompts=sum_prompts,
+                    model=request.model_name,
+                    reasoning_effort="low",
+                ),
+            )
 
             parsed_summaries_list = parse_summarization_responses(
                 responses=sum_responses,
                 documents_list=retrieved_docs,
             )
             docs = parsed_summaries_list
+        else:
+            qa_responses = await qa_coro
 
         return schemas.GenerationResponse(
             status=status.HTTP_200_OK,
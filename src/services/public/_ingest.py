@@ -1,5 +1,9 @@
+import asyncio
+import numpy as np
 from fastapi import status
+from llama_index.core.schema import BaseNode
 from src import schemas
+from src.core import config
 from src.utils import logger, download_audio
 from src.repo.postgres import upsert_data
 from src.services.internal import (
@@ -10,6 +14,81 @@ from src.services.internal import (
 )
 
 
+async def _encode_batch(
+    nodes: list[BaseNode],
+) -> tuple[np.ndarray, dict[str, schemas.TermEntry], dict[str, int]]:
+    # Gather every per-node field in one pass over the nodes
+    texts, titles, full_texts, doc_ids = [], [], [], []
+    for node in nodes:
+        text = node.text
+        title = node.metadata.get("title", "none")
+        texts.append(text)
+        titles.append(title)
+        full_texts.append(f"{title}\n\n{text}")
+        doc_ids.append(node.id_)
+
+    # Dense encoding (GPU, releases the GIL) and inverted index building
+    # (tokenizer, CPU) are independent, so they run in worker threads at once
+    dense_embeddings, (postings_list, doc_lens) = await asyncio.gather(
+        asyncio.to_thread(
+            dense_encode,
+            text_type="document",
+            texts=texts,
+            titles=titles,
+        ),
+        asyncio.to_thread(
+            build_inverted_index,
+            doc_ids=doc_ids,
+            texts=full_texts,
+        ),
+    )
+
+    logger.info(
+        "Generated %d dense embeddings with each embedding's size is: %d",
+        *dense_embeddings.shape,
+    )
+    logger.info("Built inverted index with size: %d", len(postings_list))
+
+    return dense_embeddings, postings_list, doc_lens
+
+
+async def _encode_and_upsert(
+    nodes: list[BaseNode],
+    collection_name: str,
+    batch_size: int = config.INGEST_BATCH_SIZE,
+) -> None:
+    """Encode nodes in batches, writing each batch while the next one is encoded."""
+    starts = range(0, len(nodes), batch_size)
+    upsert_task: asyncio.Task | None = None
+    try:
+        for start in starts:
+            batch = nodes[start : start + batch_size]
+            dense_embeddings, postings_list, doc_lens = await _encode_batch(batch)
+
+            # At most one batch is written at a time, in order
+            if upsert_task is not None:
+                await upsert_task
+
+            # Earlier batches only fill their new rows' BM25 stats; the last refreshes all
+            upsert_task = asyncio.create_task(
+                upsert_data(
+                    nodes=batch,
+                    dense_embeddings=dense_embeddings,
+                    postings_list=postings_list,
+                    doc_lens=doc_lens,
+                    collection_name=collection_name,
+                    vacuum=start == starts[-1],
+                )
+            )
+
+        if upsert_task is not None:
+            await upsert_task
+    except BaseException:
+        if upsert_task is not None:
+            upsert_task.cancel()
+        raise
+
+
 async def ingest_documents(
     request: schemas.DocumentIngestionRequest,
 ) -> schemas.IngestionResponse:
@@ -18,7 +97,8 @@ async def ingest_documents(
             raise ValueError("No file paths or directory provided in event data.")
 
         logger.info(
-            f"Starting documents ingestion process to the collection '{request.collection_name}'..."
+            "Starting documents ingestion process to the collection '%s'...",
+            request.collection_name,
         )
 
         nodes = await process_documents(
@@ -28,42 +108,14 @@ async def ingest_documents(
         if len(nodes) == 0:
             raise ValueError("No nodes were created from the provided documents.")
 
-        logger.info(f"Processed {len(nodes)} chunks with UUIDs and metadata.")
+        logger.info("Processed %d chunks with UUIDs and metadata.", len(nodes))
 
-        texts = [node.text for node in nodes]
-        titles = [node.metadata.get("title", "none") for node in nodes]
-        full_texts = [f"{title}\n\n{text}" for title, text in zip(titles, texts)]
-
-        # Create dense embeddings for the docs
-        dense_embeddings = dense_encode(
-            text_type="document",
-            texts=texts,
-            titles=titles,
-        )
-
-        logger.info(
-            f"Generated {len(dense_embeddings)} dense embeddings with each embedding's size is: {len(dense_embeddings[0])}"
-        )
-
-        # Build inverted index (postings list) for the docs
-        postings_list, doc_lens = build_inverted_index(
-            doc_ids=[node.id_ for node in nodes],
-            texts=full_texts,
-        )
-
-        logger.info(f"Built inverted index with size: {len(postings_list)}")
-
-        # Upsert data (embeddings + postings list) into DB
-        upsert_data(
-            nodes=nodes,
-            dense_embeddings=dense_embeddings,
-            postings_list=postings_list,
-            doc_lens=doc_lens,
-            collection_name=request.collection_name,
-        )
+        await _encode_and_upsert(nodes, collection_name=request.collection_name)
 
         logger.info(
-            f"Completed ingestion process of {len(nodes)} documents for collection '{request.collection_name}'."
+            "Completed ingestion process of %d documents for collection '%s'.",
+            len(nodes),
+            request.collection_name,
         )
 
         return schemas.IngestionResponse(
@@ -72,7 +124,7 @@ async def ingest_documents(
         )
 
     except Exception as e:
-        logger.error(f"Error while ingesting documents: {e}")
+        logger.error("Error while ingesting documents: %s", e)
 
         return schemas.IngestionResponse(
             status=status.HTTP_500_INTERNAL_SERVER_ERROR, message=str(e)
@@ -87,7 +139,8 @@ async def ingest_audios(
             raise ValueError("No audio file paths or URLs provided in request data.")
 
         logger.info(
-            f"Starting audio ingestion process to the collection '{request.collection_name}'..."
+            "Starting audio ingestion process to the collection '%s'...",
+            request.collection_name,
         )
 
         download_filepaths = download_audio(urls=request.urls)
@@ -113,7 +166,7 @@ async def ingest_audios(
             message=f"Ingested {len(total_filepaths)} audio files into collection '{request.collection_name}'.",
         )
     except Exception as e:
-        logger.error(f"Error while ingesting audios: {e}")
+        logger.error("Error while ingesting audios: %s", e)
 
         return schemas.IngestionResponse(
             status=status.HTTP_500_INTERNAL_SERVER_ERROR, message=str(e)
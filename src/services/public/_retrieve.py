@@ -17,7 +17,8 @@ async def retrieve_documents(
             raise ValueError("No query text provided in event data.")
 
         logger.info(
-            f"Starting document retrieval process for the {len(request.queries)} input queries..."
+            "Starting document retrieval process for the %d input queries...",
+            len(request.queries),
         )
 
         # Generate dense embeddings for the queries
@@ -30,27 +31,30 @@ async def retrieve_documents(
                     f"Query embeddings generation failed or returned incorrect count: {len(dense_query_embeddings)}"
                 )
             logger.info(
-                f"Generated {len(dense_query_embeddings)} dense query embeddings with each embedding's length is: {len(dense_query_embeddings[0])}"
+                "Generated %d dense query embeddings with each embedding's length is: %d",
+                *dense_query_embeddings.shape,
             )
 
         # Retrieve documents based on the specified mode
         logger.info(
-            f"Performing '{request.mode}' retrieval from collection '{request.collection_name}'."
+            "Performing '%s' retrieval from collection '%s'.",
+            request.mode,
+            request.collection_name,
         )
         if request.mode == "dense":
-            results = dense_search(
+            results = await dense_search(
                 query_embeddings=dense_query_embeddings,
                 collection_name=request.collection_name,
                 top_k=request.top_k,
             )
         elif request.mode == "sparse":
-            results = sparse_search(
+            results = await sparse_search(
                 query_texts=request.queries,
                 collection_name=request.collection_name,
                 top_k=request.top_k,
             )
         elif request.mode == "hybrid":
-            results = hybrid_search(
+            results = await hybrid_search(
                 dense_query_embeddings=dense_query_embeddings,
                 query_texts=request.queries,
                 collection_name=request.collection_name,
@@ -73,7 +77,10 @@ async def retrieve_documents(
             results = [res[: request.top_k] for res in results]
 
         logger.info(
-            f"Retrieved top {request.top_k} similar documents for each of the {len(request.queries)} queries from collection '{request.collection_name}'."
+            "Retrieved top %d similar documents for each of the %d queries from collection '%s'.",
+            request.top_k,
+            len(request.queries),
+            request.collection_name,
         )
 
         return schemas.RetrievalResponse(
@@ -82,7 +89,7 @@ async def retrieve_documents(
         )
 
     except Exception as e:
-        logger.error(f"Error in retrieve_documents: {e}")
+        logger.error("Error in retrieve_documents: %s", e)
         return schemas.RetrievalResponse(
             status=status.HTTP_500_INTERNAL_SERVER_ERROR, results=[]
         )
@@ -1,5 +1,6 @@
 from ._tokenizer import tokenize
-from ._calc import *
 from ._logging import logger
 from ._fuse import fuse_results
 from ._download import download_audio
+from ._cache import LRUCache, ProximityCache, SQLiteCache
+from ._retry import retry_async
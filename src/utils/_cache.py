@@ -0,0 +1,147 @@
+import os
+import sqlite3
+import threading
+import numpy as np
+from collections import OrderedDict, namedtuple
+from typing import Any, Hashable
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class LRUCache:
+    """Thread-safe bounded LRU mapping with `functools.lru_cache`-style stats."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self._hits += 1
+                return self._data[key]
+            self._misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._data))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+class ProximityCache:
+    """Bounded FIFO of query vectors that serves any lookup within cosine `tau`."""
+
+    def __init__(self, tau: float, maxsize: int = 256):
+        self.tau = tau
+        self.maxsize = maxsize
+        self._mat: np.ndarray | None = None  # (maxsize, dim) unit-norm rows
+        self._scopes: list[Hashable] = []
+        self._values: list[Any] = []
+        self._next = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _normalize(vec) -> np.ndarray | None:
+        v = np.asarray(vec, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(v))
+        return v / norm if norm > 0 else None
+
+    def get(self, vec, scope: Hashable, default: Any = None) -> Any:
+        q = self._normalize(vec)
+        with self._lock:
+            if q is None or self._mat is None or q.shape[0] != self._mat.shape[1]:
+                self._misses += 1
+                return default
+            size = len(self._values)
+            sims = self._mat[:size] @ q
+            # Only entries from the same scope (collection, top_k, ...) are eligible
+            for i, s in enumerate(self._scopes):
+                if s != scope:
+                    sims[i] = -np.inf
+            best = int(np.argmax(sims))
+            if sims[best] >= self.tau:
+                self._hits += 1
+                return self._values[best]
+            self._misses += 1
+            return default
+
+    def put(self, vec, scope: Hashable, value: Any) -> None:
+        q = self._normalize(vec)
+        if q is None or self.maxsize <= 0:
+            return
+        with self._lock:
+            if self._mat is None:
+                self._mat = np.zeros((self.maxsize, q.shape[0]), dtype=np.float32)
+            elif q.shape[0] != self._mat.shape[1]:
+                return
+            i = self._next
+            self._mat[i] = q
+            if i < len(self._values):
+                self._scopes[i] = scope
+                self._values[i] = value
+            else:
+                self._scopes.append(scope)
+                self._values.append(value)
+            self._next = (i + 1) % self.maxsize
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._values))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._mat = None
+            self._scopes.clear()
+            self._values.clear()
+            self._next = 0
+            self._hits = 0
+            self._misses = 0
+
+
+class SQLiteCache:
+    """Persistent string key/value store backed by a single SQLite file (WAL mode)."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ?;", (key,)
+            ).fetchone()
+        return row[0] if row is not None else default
+
+    def put(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?);", (key, value)
+            )
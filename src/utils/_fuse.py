@@ -1,12 +1,51 @@
 import numpy as np
-from typing import Literal, Union
+from typing import Literal, Optional, Union
 from src import schemas
 from src.core import config
 
 FusionMethod = Literal["rrf", "dbsf"]
 
 
-from collections import defaultdict
+def _align(
+    results1: list[schemas.RetrievedDocument],
+    results2: list[schemas.RetrievedDocument],
+) -> tuple[list[schemas.RetrievedDocument], np.ndarray, np.ndarray]:
+    """Map both result lists onto one array of unique docs, in first-seen order."""
+    positions: dict[Union[str, int], int] = {}
+    docs: list[schemas.RetrievedDocument] = []
+
+    def _positions_of(results: list[schemas.RetrievedDocument]) -> np.ndarray:
+        pos = np.empty(len(results), dtype=np.intp)
+        for i, doc in enumerate(results):
+            j = positions.setdefault(doc.id, len(docs))
+            if j == len(docs):
+                docs.append(doc)
+            pos[i] = j
+        return pos
+
+    pos1 = _positions_of(results1)
+    pos2 = _positions_of(results2)
+    return docs, pos1, pos2
+
+
+def _collect(
+    docs: list[schemas.RetrievedDocument],
+    fused_scores: np.ndarray,
+    top_k: Optional[int],
+) -> list[schemas.RetrievedDocument]:
+    # Stable sort keeps first-seen order among ties; only survivors are materialized
+    order = np.argsort(-fused_scores, kind="stable")
+    if top_k is not None:
+        order = order[:top_k]
+
+    return [
+        schemas.RetrievedDocument.model_construct(
+            id=docs[i].id,
+            score=float(fused_scores[i]),
+            payload=docs[i].payload,
+        )
+        for i in order
+    ]
 
 
 def _fuse_rrf(
@@ -14,86 +53,53 @@ def _fuse_rrf(
     results2: list[schemas.RetrievedDocument],
     alpha: float = config.FUSION_ALPHA,
     k: int = config.RRF_K,
+    top_k: Optional[int] = None,
 ) -> list[schemas.RetrievedDocument]:
-    fused_scores = defaultdict(float)
-    all_docs: dict[Union[str, int], schemas.RetrievedDocument] = {}
+    docs, pos1, pos2 = _align(results1, results2)
+    if not docs:
+        return []
 
-    for rank, doc in enumerate(results1):
-        fused_scores[doc.id] += alpha * (1 / (k + rank))
-        if doc.id not in all_docs:
-            all_docs[doc.id] = doc
+    fused_scores = np.zeros(len(docs), dtype=np.float64)
+    np.add.at(fused_scores, pos1, alpha * (1 / (k + np.arange(len(pos1)))))
+    np.add.at(fused_scores, pos2, (1 - alpha) * (1 / (k + np.arange(len(pos2)))))
 
-    for rank, doc in enumerate(results2):
-        fused_scores[doc.id] += (1 - alpha) * (1 / (k + rank))
-        if doc.id not in all_docs:
-            all_docs[doc.id] = doc
+    return _collect(docs, fused_scores, top_k)
 
-    if not fused_scores:
-        return []
 
-    fused_results = [
-        schemas.RetrievedDocument(
-            id=doc_id,
-            score=score,
-            payload=all_docs[doc_id].payload,
-        )
-        for doc_id, score in fused_scores.items()
-    ]
-    fused_results.sort(key=lambda x: x.score, reverse=True)
+def _dbsf_normalize(scores: np.ndarray, coef: float) -> np.ndarray:
+    if scores.size == 0:
+        return scores
+
+    # Handle case where all scores are the same (or too few to estimate a spread)
+    std = np.std(scores, ddof=1) if scores.size > 1 else 0.0
+    if std == 0:
+        return np.full_like(scores, 0.5)
+
+    mean = np.mean(scores)
+    ub, lb = mean + 3 * std, mean - 3 * std
+    score_range = ub - lb
 
-    return fused_results
+    return coef * ((scores - lb) / score_range)
 
 
 def _fuse_dbsf(
     results1: list[schemas.RetrievedDocument],
     results2: list[schemas.RetrievedDocument],
     alpha: float = config.FUSION_ALPHA,
+    top_k: Optional[int] = None,
 ) -> list[schemas.RetrievedDocument]:
-    fused_scores = defaultdict(float)
-    all_docs: dict[Union[str, int], schemas.RetrievedDocument] = {}
-
-    def _normalize_and_fuse(
-        results: list[schemas.RetrievedDocument], coef: float
-    ) -> None:
-        scores = np.array([doc.score for doc in results])
-        if scores.size == 0:
-            return
-
-        mean, std = np.mean(scores), np.std(scores, ddof=1)
-        # Handle case where all scores are the same
-        if std == 0:
-            for doc in results:
-                if doc.id not in all_docs:
-                    all_docs[doc.id] = doc
-                fused_scores[doc.id] += 0.5
-            return
-
-        ub, lb = mean + 3 * std, mean - 3 * std
-        score_range = ub - lb
-
-        for doc in results:
-            if doc.id not in all_docs:
-                all_docs[doc.id] = doc
-            normalized_score = (doc.score - lb) / score_range
-            fused_scores[doc.id] += coef * normalized_score
-
-    _normalize_and_fuse(results1, alpha)
-    _normalize_and_fuse(results2, 1 - alpha)
-
-    if not fused_scores:
+    docs, pos1, pos2 = _align(results1, results2)
+    if not docs:
         return []
 
-    fused_results = [
-        schemas.RetrievedDocument(
-            id=doc_id,
-            score=score,
-            payload=all_docs[doc_id].payload,
-        )
-        for doc_id, score in fused_scores.items()
-    ]
-    fused_results.sort(key=lambda x: x.score, reverse=True)
+    scores1 = np.fromiter((doc.score for doc in results1), np.float64, len(results1))
+    scores2 = np.fromiter((doc.score for doc in results2), np.float64, len(results2))
+
+    fused_scores = np.zeros(len(docs), dtype=np.float64)
+    np.add.at(fused_scores, pos1, _dbsf_normalize(scores1, alpha))
+    np.add.at(fused_scores, pos2, _dbsf_normalize(scores2, 1 - alpha))
 
-    return fused_results
+    return _collect(docs, fused_scores, top_k)
 
 
 def fuse_results(
@@ -101,10 +107,11 @@ def fuse_results(
     results2: list[schemas.RetrievedDocument],
     alpha: float = config.FUSION_ALPHA,  # weight for first result set
     method: FusionMethod = config.FUSION_METHOD,
+    top_k: Optional[int] = None,
 ) -> list[schemas.RetrievedDocument]:
     if method == "rrf":
-        return _fuse_rrf(results1, results2, alpha)
+        return _fuse_rrf(results1, results2, alpha, top_k=top_k)
     elif method == "dbsf":
-        return _fuse_dbsf(results1, results2, alpha)
+        return _fuse_dbsf(results1, results2, alpha, top_k=top_k)
     else:
         raise ValueError(f"Unknown fusion method: {method}")
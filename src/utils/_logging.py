@@ -1,14 +1,18 @@
 import logging
 
 
+_SYNC_PHRASES = ("syncing app", "out-of-band sync")
+
+
 class NoInngestSyncFilter(logging.Filter):
     def filter(self, record):
-        msg = record.getMessage().lower()
-        if "syncing app" in msg or "out-of-band sync" in msg:
-            return False
         # optionally drop messages coming from the inngest module
         if record.name.startswith("inngest"):
             return False
+        # Cheap name check first; only other records get formatted and lowered
+        msg = record.getMessage().lower()
+        if any(phrase in msg for phrase in _SYNC_PHRASES):
+            return False
         return True
 
 
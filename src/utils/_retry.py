@@ -0,0 +1,30 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, Optional, TypeVar
+from ._logging import logger
+
+T = TypeVar("T")
+
+
+async def retry_async(
+    fn: Callable[[], Awaitable[T]],
+    retry_on: tuple[type[BaseException], ...],
+    max_retries: int = 5,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+    retry_if: Optional[Callable[[BaseException], bool]] = None,
+) -> T:
+    """Await `fn()`, retrying transient errors with capped exponential backoff and jitter."""
+    for attempt in range(max_retries + 1):
+        try:
+            return await fn()
+        except retry_on as e:
+            if attempt == max_retries or (retry_if is not None and not retry_if(e)):
+                raise
+            delay = (
+                min(max_delay, base_delay * 2**attempt) + random.random() * base_delay
+            )
+            logger.warning(
+                f"Attempt {attempt + 1}/{max_retries + 1} failed ({type(e).__name__}: {e}); retrying in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
@@ -1,31 +1,54 @@
 from underthesea import word_tokenize
+import multiprocessing
 import string
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from src.core import config
 
 _current_dir = Path(__file__).parent
 _stopwords_path = _current_dir / "vietnamese-stopwords.txt"
 
-with open(_stopwords_path, "r", encoding="utf-8") as f:
-    _stopwords: set[str] = set(line.strip() for line in f)
+# One read and decode, then split; blank lines are skipped
+_stopwords: frozenset[str] = frozenset(
+    word
+    for word in (
+        line.strip()
+        for line in _stopwords_path.read_bytes().decode("utf-8").splitlines()
+    )
+    if word
+)
 
-_punctuations: set[str] = set([p for p in string.punctuation])
+_punctuations: frozenset[str] = frozenset(string.punctuation)
 
+# Punctuation and stopwords are dropped together in one membership test
+_removed_tokens: frozenset[str] = _stopwords | _punctuations
 
-def tokenize(
-    texts: list[str],
-) -> list[list[str]]:
-    tokenized_texts = [word_tokenize(text.lower()) for text in texts]
 
-    # Remove punctuation
-    punc_removed_tok_lists = [
-        [token for token in tokens if token not in _punctuations]
-        for tokens in tokenized_texts
-    ]
+def _tokenize_one(text: str) -> list[str]:
+    removed = _removed_tokens
+    return [token for token in word_tokenize(text.lower()) if token not in removed]
+
 
-    # Remove stopwords
-    sw_removed_tok_lists = [
-        [token for token in tokens if token not in _stopwords]
-        for tokens in punc_removed_tok_lists
-    ]
+@lru_cache(maxsize=1)
+def _get_tokenize_pool() -> ProcessPoolExecutor:
+    # spawn, not fork: the parent holds CUDA contexts and library threads
+    return ProcessPoolExecutor(
+        max_workers=config.TOKENIZE_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
 
-    return sw_removed_tok_lists
+
+def tokenize(
+    texts: list[str],
+) -> list[list[str]]:
+    # underthesea is CPU-bound Python, so large batches are spread across cores
+    if (
+        config.TOKENIZE_PARALLEL_MIN > 0
+        and config.TOKENIZE_WORKERS > 1
+        and len(texts) >= config.TOKENIZE_PARALLEL_MIN
+    ):
+        chunksize = max(1, len(texts) // (4 * config.TOKENIZE_WORKERS))
+        return list(_get_tokenize_pool().map(_tokenize_one, texts, chunksize=chunksize))
+
+    return [_tokenize_one(text) for text in texts]